@@ -1,10 +1,25 @@
 import random
 import numpy as np
 from utils.tsp_utils import total_distance
+from utils.distance import DistanceMatrix
+from utils.candidates import candidate_lists
+from algorithms.local_search import LocalSearch
+from algorithms.construction import nearest_neighbour, cheapest_insertion, drop_city
+from utils import checkpoint
+from utils.history import History
+from utils.profiling import Profiler
+from utils.diversity import branching_factor, pheromone_entropy
+from algorithms.observer import Observable
+from algorithms.dynamic import DynamicInstance, remap_sparse
 
-class ACO:
+class ACO(Observable, DynamicInstance):
     def __init__(self, cities, n_ants=50, n_iter=500,
-                 alpha=1, beta=2, rho=0.1, q=1, patience=200):
+                 alpha=1, beta=2, rho=0.1, q=1, patience=200,
+                 vectorized=True, seed=None, dist=None, candidates=None,
+                 local_search=None, variant="as", mmas_deposit="iteration", p_best=0.05,
+                 reinit_after=50, q0=0.9, xi=0.1, checkpoint_path=None, checkpoint_every=0, history=None,
+                 profile=False, tau0=None, converge_metric="branching", converge_threshold=None,
+                 converge_action="stop", converge_every=10, restart_fraction=0.5, branching_lambda=0.05):
         self.cities = cities
         self.n = len(cities)
         self.n_ants = n_ants
@@ -14,19 +29,96 @@ class ACO:
         self.rho = rho
         self.q = q
         self.patience = patience  # Tham số kiên nhẫn
+        self.vectorized = vectorized  # Xây tour cho cả đàn kiến cùng lúc bằng NumPy
+        self.rng = np.random.default_rng(seed)
+        self.random = random.Random(seed)  # Cho các nhánh viết bằng list Python; không đụng tới module random
 
-        self.dist = self._calc_dist()
-        self.pheromone = np.ones((self.n, self.n))
-        self.history = []
+        # Biến thể cập nhật pheromone:
+        #   "as"   - Ant System gốc: mọi kiến đều rải pheromone
+        #   "mmas" - MAX-MIN: chỉ kiến tốt nhất (vòng / toàn cục) rải, kẹp trong [tau_min, tau_max], khởi tạo lại khi trì trệ
+        #   "acs"  - Ant Colony System: luật chọn giả ngẫu nhiên q0, cập nhật cục bộ khi đi, cập nhật toàn cục trên tour tốt nhất
+        if variant not in ("as", "mmas", "acs"):
+            raise ValueError(f"variant phải là 'as', 'mmas' hoặc 'acs', không phải {variant!r}")
+        # _build_tour (vectorized=False, không có candidates) không có luật q0 và cập nhật cục bộ của ACS
+        if variant == "acs" and not vectorized and candidates is None:
+            raise ValueError("variant='acs' cần vectorized=True (hoặc candidates)")
+        self.variant = variant
+        self.mmas_deposit = mmas_deposit  # "iteration" hoặc "global"
+        self.p_best = p_best
+        self.reinit_after = reinit_after
+        self.q0 = q0
+        self.xi = xi
+        self.best_tour = None
+        self.best_len = float("inf")
+        self.stall = 0  # Số vòng không cải thiện kể từ lần khởi tạo lại pheromone gần nhất (MMAS)
 
-    def _calc_dist(self):
-        d = np.zeros((self.n, self.n))
-        for i in range(self.n):
-            for j in range(self.n):
-                d[i][j] = np.linalg.norm(
-                    np.array(self.cities[i]) - np.array(self.cities[j])
-                )
-        return d
+        # candidates = k (hoặc mảng n x k có sẵn): kiến chỉ chọn trong k láng giềng gần nhất
+        if candidates is None:
+            self.cand = None
+        elif np.isscalar(candidates):
+            self.cand = candidate_lists(cities, candidates)
+        else:
+            self.cand = np.asarray(candidates, dtype=np.int32)
+
+        # Ma trận khoảng cách dùng chung (có thể truyền vào để tái sử dụng giữa GA/ACO)
+        if dist is None:
+            dist = DistanceMatrix(cities, lazy=self.cand is not None)
+        self.dm = dist
+
+        if self.cand is None:
+            self.dist = self.dm.dense()
+            # eta = (1/d)^beta không đổi trong suốt quá trình chạy -> tính trước một lần
+            self.eta = (1 / (self.dist + 1e-6)) ** self.beta
+            self.pheromone = np.ones((self.n, self.n))
+        else:
+            # Dạng thưa n x k: pheromone[i][s] là cạnh (i, cand[i][s]);
+            # mọi cạnh ngoài danh sách ứng viên dùng chung giá trị tau_rest
+            self.dist = None
+            cand_dist = self.dm.between(np.arange(self.n)[:, None], self.cand)
+            self.eta = (1 / (cand_dist + 1e-6)) ** self.beta
+            self.pheromone = np.ones(self.cand.shape)
+            self.tau_rest = 1.0
+
+        # Pheromone ban đầu theo độ dài tour láng giềng gần nhất C_nn:
+        # AS m / C_nn, MMAS tau_max ước lượng q / (rho * C_nn), ACS 1 / (n * C_nn); tau0=1.0 giữ cách cũ
+        if tau0 is None:
+            c_nn = self.dm.tour_length(nearest_neighbour(cities, cand=self.cand))
+            if variant == "as":
+                tau0 = self.q * self.n_ants / c_nn
+            elif variant == "mmas":
+                tau0 = self.q / (self.rho * c_nn)
+            else:
+                tau0 = 1.0 / (self.n * c_nn)
+        self.tau0 = tau0
+        self.pheromone.fill(self.tau0)
+        if self.cand is not None:
+            self.tau_rest = self.tau0
+
+        # Tối ưu cục bộ con kiến tốt nhất mỗi vòng (True hoặc một LocalSearch đã cấu hình)
+        if local_search is True:
+            local_search = LocalSearch(cities, candidates=self.cand if self.cand is not None else 10)
+        self.local_search = local_search
+        self.history = History.make(history)
+
+        # Lưu trạng thái ra checkpoint_path (.npz) sau mỗi checkpoint_every vòng (0 = tắt)
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self._resume = False
+        # Đo thời gian từng pha + bộ đếm (tắt mặc định); đọc qua stats()
+        self.profiler = Profiler.make(profile)
+        # Pheromone bão hoà (lambda-branching factor hoặc entropy < converge_threshold) -> dừng sớm
+        # hoặc kéo pheromone về tau0 một phần (restart_fraction). ACS phải dùng "entropy": cạnh chưa kiến nào
+        # đi vẫn ở tau0 nên branching ~2 gần như ngay từ đầu; không tự đổi metric vì hai thang đo khác nhau
+        # (branching 2..n, entropy 0..1) -> ngưỡng chọn cho metric này vô nghĩa với metric kia.
+        # Entropy của ACS cũng chỉ giảm nhẹ (đa số cạnh vẫn ở tau0): ngưỡng cần sát 1, vd. 0.93
+        if converge_metric not in ("branching", "entropy"):
+            raise ValueError(f"converge_metric phải là 'branching' hoặc 'entropy', không phải {converge_metric!r}")
+        if variant == "acs" and converge_metric == "branching" and converge_threshold is not None:
+            raise ValueError("variant='acs' cần converge_metric='entropy' (branching factor của ACS ~2 ngay từ đầu)")
+        self.converge_metric = converge_metric
+        self.branching_lambda = branching_lambda
+        self._setup_convergence(converge_threshold, converge_action, converge_every, restart_fraction)
+        self._setup_events()
 
     def _select_next(self, cur, visited):
         probs = []
@@ -39,9 +131,9 @@ class ACO:
         total = sum(p[1] for p in probs)
         if total == 0:
             unvisited = [node for node in range(self.n) if node not in visited]
-            return random.choice(unvisited) if unvisited else probs[-1][0]
+            return self.random.choice(unvisited) if unvisited else probs[-1][0]
 
-        r = random.random() * total
+        r = self.random.random() * total
         s = 0
         for city, p in probs:
             s += p
@@ -50,7 +142,7 @@ class ACO:
         return probs[-1][0]
 
     def _build_tour(self):
-        start = random.randint(0, self.n - 1)
+        start = self.random.randint(0, self.n - 1)
         tour = [start]
         visited = {start}
         while len(tour) < self.n:
@@ -59,47 +151,331 @@ class ACO:
             visited.add(nxt)
         return tour
 
-    def _update_pheromone(self, tours):
+    def _pick(self, w):
+        # Roulette theo tổng tích lũy trên từng hàng; ACS: với xác suất q0 chọn luôn cạnh tốt nhất
+        m, k = w.shape
+        cum = np.cumsum(w, axis=1)
+        total = cum[:, -1]
+        r = self.rng.random(m) * total
+        idx = np.minimum((cum <= r[:, None]).sum(axis=1), k - 1)
+        if self.variant == "acs":
+            idx = np.where(self.rng.random(m) < self.q0, w.argmax(axis=1), idx)
+        return idx, total
+
+    def _local_update(self, choice, cur, nxt):
+        # ACS: kiến vừa đi qua cạnh nào thì làm bay hơi một phần pheromone cạnh đó về tau0
+        rows, cols, _ = self._edge_slots(cur, nxt)
+        tau = (1 - self.xi) * self.pheromone[rows, cols] + self.xi * self.tau0
+        self.pheromone[rows, cols] = tau
+        choice[rows, cols] = tau ** self.alpha * self.eta[rows, cols]
+
+    def _choice_info(self):
+        # choice_info[i][j] = tau^alpha * eta^beta, dùng chung cho mọi kiến trong một vòng lặp
+        return self.pheromone ** self.alpha * self.eta
+
+    def _build_tours(self):
+        if self.cand is not None:
+            return self._build_tours_cand()
+
+        # Cả n_ants kiến đi song song: mỗi bước chọn thành phố kế tiếp cho tất cả kiến
+        m, n = self.n_ants, self.n
+        choice = self._choice_info()
+        ants = np.arange(m)
+        tours = np.empty((m, n), dtype=np.int32)
+        visited = np.zeros((m, n), dtype=bool)
+
+        cur = self.rng.integers(0, n, size=m)
+        tours[:, 0] = cur
+        visited[ants, cur] = True
+
+        for step in range(1, n):
+            w = choice[cur]
+            w[visited] = 0.0
+            # Roulette: thành phố đầu tiên có tổng tích lũy > r
+            nxt, total = self._pick(w)
+
+            # Tổng bằng 0 (underflow) -> chọn ngẫu nhiên đều trong các thành phố chưa đi
+            stuck = np.flatnonzero(total <= 0)
+            if len(stuck):
+                nxt[stuck], _ = self._pick((~visited[stuck]).astype(np.float64))
+
+            tours[:, step] = nxt
+            visited[ants, nxt] = True
+            if self.variant == "acs":
+                self._local_update(choice, cur, nxt)
+            cur = nxt
+        if self.variant == "acs":
+            self._local_update(choice, cur, tours[:, 0])
+        return tours
+
+    def _build_tours_cand(self):
+        m, n = self.n_ants, self.n
+        k = self.cand.shape[1]
+        choice = self._choice_info()
+        ants = np.arange(m)
+        tours = np.empty((m, n), dtype=np.int32)
+        visited = np.zeros((m, n), dtype=bool)
+
+        cur = self.rng.integers(0, n, size=m)
+        tours[:, 0] = cur
+        visited[ants, cur] = True
+
+        for step in range(1, n):
+            cand = self.cand[cur]
+            w = choice[cur]
+            w[visited[ants[:, None], cand]] = 0.0
+            idx, total = self._pick(w)
+            nxt = cand[ants, idx]
+
+            # Đã đi hết k láng giềng -> xét toàn bộ thành phố, chọn thành phố gần nhất chưa đi
+            for a in np.flatnonzero(total <= 0):
+                d = self.dm.row(cur[a]).astype(np.float64)
+                d[visited[a]] = np.inf
+                nxt[a] = np.argmin(d)
+
+            tours[:, step] = nxt
+            visited[ants, nxt] = True
+            if self.variant == "acs":
+                self._local_update(choice, cur, nxt)
+            cur = nxt
+        if self.variant == "acs":
+            self._local_update(choice, cur, tours[:, 0])
+        return tours
+
+    def _tour_lengths(self, tours):
+        return self.dm.tour_lengths(tours)
+
+    def _edge_slots(self, a, b):
+        # Chỉ số (hàng, cột) trong self.pheromone của các cạnh (a, b) theo cả hai chiều.
+        # Dạng thưa: cạnh không nằm trong danh sách ứng viên bị bỏ qua (mask trả về cho biết cạnh nào được giữ)
+        u = np.concatenate([a, b])
+        v = np.concatenate([b, a])
+        if self.cand is None:
+            return u, v, None
+        match = self.cand[u] == v[:, None]
+        has = match.any(axis=1)
+        return u[has], match.argmax(axis=1)[has], has
+
+    def _deposit(self, tours, amounts):
+        # Rải pheromone cho mọi cạnh của nhiều tour cùng lúc bằng np.add.at (cạnh trùng được cộng dồn)
+        a = tours.ravel()
+        b = np.roll(tours, -1, axis=1).ravel()
+        amount = np.repeat(amounts, tours.shape[1])
+        rows, cols, has = self._edge_slots(a, b)
+        amount = np.concatenate([amount, amount])
+        np.add.at(self.pheromone, (rows, cols), amount if has is None else amount[has])
+
+    def _evaporate(self):
         self.pheromone *= (1 - self.rho)
-        for tour in tours:
-            length = total_distance(tour, self.cities)
-            for i in range(len(tour)):
-                a = tour[i]
-                b = tour[(i + 1) % self.n]
-                self.pheromone[a][b] += self.q / length
-                self.pheromone[b][a] += self.q / length
-
-    def run_stepwise(self):
-        best_tour = None
-        best_len = float("inf")
-        no_improve = 0 
-
-        for it in range(self.n_iter):
-            # Kiểm tra kiên nhẫn
-            if no_improve >= self.patience:
-                yield it, best_tour, best_len, False # False = Đã dừng
-                break
-
-            tours = []
-            improved = False
-            for _ in range(self.n_ants):
-                tour = self._build_tour()
-                tours.append(tour)
-                length = total_distance(tour, self.cities)
-                
-                if length < best_len:
-                    best_len = length
-                    best_tour = list(tour)
-                    improved = True
-
-            # Logic Patience
-            if improved:
-                no_improve = 0
-            else:
-                no_improve += 1
+        if self.cand is not None:
+            self.tau_rest *= (1 - self.rho)
+
+    def _update_pheromone(self, tours, lengths=None):
+        # lengths: độ dài đã tính trong run_stepwise -> không tính lại
+        tours = np.asarray(tours)
+        if lengths is None:
+            lengths = self._tour_lengths(tours)
+        lengths = np.asarray(lengths, dtype=np.float64)
+
+        if self.variant == "as":
+            self._evaporate()
+            self._deposit(tours, self.q / lengths)
+        elif self.variant == "mmas":
+            self._update_mmas(tours, lengths)
+        else:
+            # ACS: chỉ cạnh của tour tốt nhất toàn cục bay hơi + được rải
+            best = np.asarray(self.best_tour)
+            rows, cols, _ = self._edge_slots(best, np.roll(best, -1))
+            self.pheromone[rows, cols] = (1 - self.rho) * self.pheromone[rows, cols] + self.rho * self.q / self.best_len
+
+    def _update_mmas(self, tours, lengths):
+        self._evaporate()
+        if self.mmas_deposit == "global":
+            self._deposit(np.asarray(self.best_tour)[None], np.array([self.q / self.best_len]))
+        else:
+            k = int(np.argmin(lengths))
+            self._deposit(tours[k:k + 1], self.q / lengths[k:k + 1])
+
+        tau_max = self.q / (self.rho * self.best_len)
+        p_dec = self.p_best ** (1.0 / self.n)
+        avg = self.pheromone.shape[1] / 2.0
+        tau_min = tau_max * (1 - p_dec) / ((avg - 1) * p_dec) if avg > 1 else tau_max / (2 * self.n)
+        tau_min = min(tau_min, tau_max)
+
+        # Trì trệ quá lâu -> khởi tạo lại toàn bộ pheromone về tau_max
+        if self.reinit_after is not None and self.stall >= self.reinit_after:
+            self.pheromone.fill(tau_max)
+            self.tau_rest = tau_max
+            self.stall = 0
+            return
+        np.clip(self.pheromone, tau_min, tau_max, out=self.pheromone)
+        if self.cand is not None:
+            self.tau_rest = min(max(self.tau_rest, tau_min), tau_max)
+
+    def _init_run(self):
+        self.best_tour = None
+        self.best_len = float("inf")
+        self.no_improve = 0
+        self.stall = 0
+        self.it = 0
+
+    def _construct(self):
+        # Xây tour cho cả đàn trong một vòng, trả về (tours, lengths)
+        if self.vectorized or self.cand is not None:
+            tours = self._build_tours()
+            return tours, self._tour_lengths(tours)
+
+        tours = []
+        lengths = []
+        for _ in range(self.n_ants):
+            tour = self._build_tour()
+            tours.append(tour)
+            lengths.append(total_distance(tour, self.cities, self.dm))
+        return tours, np.array(lengths)
+
+    def step(self):
+        t = self.profiler.tic()
+        tours, lengths = self._construct()
+        self.profiler.toc("construct", t)
+        self.profiler.count("tours_built", len(tours))
+        self.profiler.count("tour_evaluations", len(tours))
+        k = int(np.argmin(lengths))
+        if self.local_search is not None:
+            t = self.profiler.tic()
+            tours[k] = self.local_search.improve(tours[k])
+            lengths[k] = self.dm.tour_length(tours[k])
+            self.profiler.toc("local_search", t)
+            self.profiler.count("tour_evaluations")
+
+        improved = False
+        if lengths[k] < self.best_len:
+            self.best_len = float(lengths[k])
+            self.best_tour = [int(c) for c in tours[k]]
+            improved = True
+
+        # Logic Patience
+        if improved:
+            self.no_improve = 0
+            self.stall = 0
+        else:
+            self.no_improve += 1
+            self.stall += 1
+
+        t = self.profiler.tic()
+        self._update_pheromone(tours, lengths)
+        self.profiler.toc("pheromone", t)
+        self.profiler.count("iterations")
+        self.history.record(self.it, self.best_len)
+        self.it += 1
+        self._check_convergence()
+        return improved
+
+    def _convergence_metric(self):
+        if self.converge_metric == "entropy":
+            return pheromone_entropy(self.pheromone)
+        return branching_factor(self.pheromone, self.branching_lambda)
+
+    def _partial_restart(self):
+        # Làm mịn pheromone: tau = (1 - f) * tau + f * tau0 (ghi tại chỗ, giữ được bộ nhớ dùng chung)
+        f = self.restart_fraction
+        self.pheromone *= 1 - f
+        self.pheromone += f * self.tau0
+        if self.cand is not None:
+            self.tau_rest = (1 - f) * self.tau_rest + f * self.tau0
+
+    def _cand_eta(self):
+        cand_dist = self.dm.between(np.arange(self.n)[:, None], self.cand)
+        return (1 / (cand_dist + 1e-6)) ** self.beta
+
+    def _repair_best(self, repair):
+        if self.best_tour is not None:
+            self.best_tour = repair(self.best_tour).tolist()
+            self.best_len = self.dm.tour_length(self.best_tour)
+        self.no_improve = 0
+        self.stall = 0
+
+    def _city_added(self, j, old_cand):
+        if self.cand is None:
+            # Giữ nguyên pheromone đã học; hàng / cột mới nhận mức pheromone trung bình hiện tại
+            self.dist = self.dm.dense()
+            fill = float(self.pheromone.mean())
+            tau = np.full((self.n, self.n), fill)
+            tau[:-1, :-1] = self.pheromone
+            self.pheromone = tau
+            eta = np.empty((self.n, self.n))
+            eta[:-1, :-1] = self.eta
+            eta[j] = eta[:, j] = (1 / (self.dist[j] + 1e-6)) ** self.beta
+            self.eta = eta
+        else:
+            old_cand = np.vstack([old_cand, np.full((1, old_cand.shape[1]), -1)])
+            old_tau = np.vstack([self.pheromone, np.full((1, self.pheromone.shape[1]), self.tau_rest)])
+            self.pheromone = remap_sparse(old_cand, old_tau, self.cand, self.tau_rest)
+            self.eta = self._cand_eta()
+        self._repair_best(lambda t: cheapest_insertion([t], j, self.dm)[0])
+
+    def _city_removed(self, i, old_cand):
+        if self.cand is None:
+            self.dist = self.dm.dense()
+            self.pheromone = np.delete(np.delete(self.pheromone, i, axis=0), i, axis=1)
+            self.eta = np.delete(np.delete(self.eta, i, axis=0), i, axis=1)
+        else:
+            old_cand = np.delete(old_cand, i, axis=0)
+            old_cand = np.where(old_cand == i, -1, old_cand - (old_cand > i))
+            self.pheromone = remap_sparse(old_cand, np.delete(self.pheromone, i, axis=0), self.cand, self.tau_rest)
+            self.eta = self._cand_eta()
+        self._repair_best(lambda t: drop_city([t], i)[0])
+
+    def stats(self):
+        snap = self.profiler.snapshot()
+        snap["convergence"] = {self.converge_metric: self.convergence, "restarts": self.restarts}
+        if self.local_search is not None:
+            snap["counters"]["ls_moves"] = self.local_search.moves
+            snap["counters"]["ls_evaluations"] = self.local_search.evaluations
+        return snap
+
+    def save_checkpoint(self, path=None):
+        path = path or self.checkpoint_path
+        meta = {
+            "solver": "aco",
+            "n": self.n,
+            "variant": self.variant,
+            "it": self.it,
+            "no_improve": self.no_improve,
+            "stall": self.stall,
+            "best_len": self.best_len,
+            "tau_rest": getattr(self, "tau_rest", None),
+            "rng": checkpoint.rng_state(self.rng, self.random),
+            "history": self.history.state(),
+        }
+        self.history.flush()
+        best = self.best_tour if self.best_tour is not None else []
+        checkpoint.save(path, meta,
+                        pheromone=np.asarray(self.pheromone),
+                        best_tour=np.asarray(best, dtype=np.int32),
+                        history=self.history.to_array())
+
+    def load_checkpoint(self, path=None):
+        # Khôi phục pheromone, tour tốt nhất, bộ đếm và RNG; run / run_stepwise kế tiếp chạy tiếp từ vòng đã lưu
+        meta, arrays = checkpoint.load(path or self.checkpoint_path)
+        if meta.get("solver") != "aco" or meta["n"] != self.n or arrays["pheromone"].shape != self.pheromone.shape:
+            raise ValueError(f"checkpoint không khớp: {meta.get('solver')} với {meta.get('n')} thành phố")
+        self.pheromone[...] = arrays["pheromone"]
+        self.best_tour = arrays["best_tour"].tolist() or None
+        self.best_len = meta["best_len"]
+        self.it = meta["it"]
+        self.no_improve = meta["no_improve"]
+        self.stall = meta["stall"]
+        if meta["tau_rest"] is not None:
+            self.tau_rest = meta["tau_rest"]
+        self.history.restore(arrays["history"], meta.get("history"))
+        checkpoint.restore_rng(self.rng, meta["rng"], self.random)
+        self._resume = True
+
+    def _iteration(self):
+        return self.it
+
+    def _limit(self):
+        return self.n_iter
 
-            self._update_pheromone(tours)
-            self.history.append((it, best_len))
-            
-            # Trả về thêm biến 'improved' để GUI biết thời điểm update
-            yield it, best_tour, best_len, improved
\ No newline at end of file
+    def _best(self):
+        return self.best_tour, self.best_len
@@ -0,0 +1,212 @@
+import numpy as np
+from utils.candidates import GridIndex
+
+# Heuristic dựng tour nhanh để khởi tạo GA / ACO thay vì bắt đầu từ tour ngẫu nhiên:
+#   "nn"     - láng giềng gần nhất (danh sách ứng viên + lưới, gần O(n))
+#   "greedy" - cạnh tham lam: thêm cạnh ngắn nhất không tạo bậc 3 / chu trình con
+#   "sfc"    - thứ tự dọc đường cong Hilbert
+METHODS = ("nn", "greedy", "sfc")
+
+
+def _points(cities):
+    return np.asarray(cities, dtype=np.float64).reshape(-1, 2)
+
+
+def _nearest_alive(index, pts, alive, cur):
+    # Thành phố chưa thăm gần cur nhất: mở rộng khối ô quanh cur cho tới khi chắc chắn
+    cx, cy = index.ix[cur], index.iy[cur]
+    r = 1
+    while True:
+        members = index.block(cx, cy, r)
+        members = members[alive[members]]
+        if len(members):
+            d = np.hypot(pts[members, 0] - pts[cur, 0], pts[members, 1] - pts[cur, 1])
+            j = int(np.argmin(d))
+            # Điểm ngoài khối cách cur ít nhất r ô
+            if d[j] <= r * index.cell or index.covers_all(cx, cy, r):
+                return int(members[j])
+            r += 1
+        else:
+            r *= 2
+
+
+def nearest_neighbour(cities, start=0, cand=None, index=None):
+    # cand: danh sách ứng viên sắp theo khoảng cách (candidate_lists); ứng viên đầu tiên chưa thăm
+    # chính là láng giềng gần nhất, chỉ khi cả danh sách đã thăm mới phải tìm trên lưới
+    pts = _points(cities)
+    n = len(pts)
+    if n == 0:
+        return []
+    if index is None:
+        index = GridIndex(pts)
+    if cand is None:
+        cand = index.knn(10)
+    visited = bytearray(n)
+    cand = cand.tolist()
+    cur = start
+    visited[cur] = 1
+    tour = [cur]
+    for _ in range(n - 1):
+        nxt = -1
+        for c in cand[cur]:
+            if not visited[c]:
+                nxt = c
+                break
+        if nxt < 0:
+            alive = np.frombuffer(visited, dtype=np.uint8) == 0
+            nxt = _nearest_alive(index, pts, alive, cur)
+        visited[nxt] = 1
+        tour.append(nxt)
+        cur = nxt
+    return tour
+
+
+def greedy_edge(cities, cand=None, k=10):
+    pts = _points(cities)
+    n = len(pts)
+    if n < 3:
+        return list(range(n))
+    if cand is None:
+        cand = GridIndex(pts).knn(k)
+
+    # Cạnh ứng viên (vô hướng, không trùng) sắp theo độ dài
+    i = np.repeat(np.arange(n), cand.shape[1])
+    j = cand.ravel().astype(np.int64)
+    pairs = np.unique(np.column_stack([np.minimum(i, j), np.maximum(i, j)]), axis=0)
+    d = np.hypot(pts[pairs[:, 0], 0] - pts[pairs[:, 1], 0], pts[pairs[:, 0], 1] - pts[pairs[:, 1], 1])
+    pairs = pairs[np.argsort(d, kind="stable")].tolist()
+
+    parent = list(range(n))
+
+    def find(a):
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        return a
+
+    deg = [0] * n
+    adj = [[] for _ in range(n)]
+    for a, b in pairs:
+        if deg[a] < 2 and deg[b] < 2:
+            ra, rb = find(a), find(b)
+            if ra != rb:
+                parent[ra] = rb
+                adj[a].append(b)
+                adj[b].append(a)
+                deg[a] += 1
+                deg[b] += 1
+
+    # Các mảnh là đường đi (không có chu trình): đi từ mỗi đầu mút chưa thăm
+    frags = []
+    seen = bytearray(n)
+    for s in range(n):
+        if seen[s] or deg[s] == 2:
+            continue
+        frag = [s]
+        seen[s] = 1
+        prev, cur = -1, s
+        while True:
+            nxt = [v for v in adj[cur] if v != prev]
+            if not nxt:
+                break
+            prev, cur = cur, nxt[0]
+            frag.append(cur)
+            seen[cur] = 1
+        frags.append(frag)
+
+    # Nối các mảnh: từ đuôi tour hiện tại sang đầu mút gần nhất của mảnh còn lại
+    heads = pts[[f[0] for f in frags]]
+    tails = pts[[f[-1] for f in frags]]
+    left = np.ones(len(frags), dtype=bool)
+    left[0] = False
+    tour = list(frags[0])
+    for _ in range(len(frags) - 1):
+        p = pts[tour[-1]]
+        dh = np.where(left, np.hypot(heads[:, 0] - p[0], heads[:, 1] - p[1]), np.inf)
+        dt = np.where(left, np.hypot(tails[:, 0] - p[0], tails[:, 1] - p[1]), np.inf)
+        fh, ft = int(np.argmin(dh)), int(np.argmin(dt))
+        if dh[fh] <= dt[ft]:
+            tour.extend(frags[fh])
+            left[fh] = False
+        else:
+            tour.extend(reversed(frags[ft]))
+            left[ft] = False
+    return tour
+
+
+def space_filling_curve(cities, order=16):
+    # Chỉ số Hilbert của từng điểm trên lưới 2^order x 2^order rồi sắp xếp
+    pts = _points(cities)
+    if len(pts) == 0:
+        return []
+    side = 1 << order
+    lo = pts.min(axis=0)
+    span = max(float((pts.max(axis=0) - lo).max()), 1e-9)
+    xy = np.minimum(((pts - lo) / span * side).astype(np.int64), side - 1)
+    x, y = xy[:, 0].copy(), xy[:, 1].copy()
+    h = np.zeros(len(pts), dtype=np.int64)
+    s = side >> 1
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        h += s * s * ((3 * rx) ^ ry)
+        # Xoay góc phần tư để đường cong liền mạch
+        flip = ~ry & rx
+        x = np.where(flip, side - 1 - x, x)
+        y = np.where(flip, side - 1 - y, y)
+        swap = ~ry
+        x, y = np.where(swap, y, x), np.where(swap, x, y)
+        s >>= 1
+    return np.argsort(h, kind="stable").tolist()
+
+
+def build(method, cities, cand=None, start=0):
+    if method == "nn":
+        return nearest_neighbour(cities, start=start, cand=cand)
+    if method == "greedy":
+        return greedy_edge(cities, cand=cand)
+    if method == "sfc":
+        return space_filling_curve(cities)
+    raise ValueError(f"method phải là một trong {METHODS}, không phải {method!r}")
+
+
+def initial_tours(cities, count, rng, methods=METHODS, cand=None):
+    # count tour khởi tạo: mỗi heuristic tất định (greedy, sfc) một tour, phần còn lại là NN
+    # từ các điểm xuất phát ngẫu nhiên khác nhau để quần thể không bị trùng lặp
+    if isinstance(methods, str):
+        methods = (methods,)
+    for m in methods:
+        if m not in METHODS:
+            raise ValueError(f"method phải là một trong {METHODS}, không phải {m!r}")
+    n = len(cities)
+    if cand is None and n > 1:
+        cand = GridIndex(cities).knn(10)
+    tours = [build(m, cities, cand) for m in methods if m != "nn"][:count]
+    if "nn" in methods:
+        starts = rng.permutation(n)[:count - len(tours)]
+        tours += [nearest_neighbour(cities, start=int(s), cand=cand) for s in starts]
+    base = len(tours)
+    while base and len(tours) < count:
+        tours.append(list(tours[len(tours) % base]))
+    return tours
+
+
+def cheapest_insertion(tours, city, dm):
+    # Chèn city vào từng tour (mảng m x n) tại cạnh (a, b) có d(a, city) + d(city, b) - d(a, b) nhỏ nhất
+    t = np.asarray(tours, dtype=np.int64)
+    m, n = t.shape
+    if n == 0:
+        return np.full((m, 1), city, dtype=np.int64)
+    nxt = np.roll(t, -1, axis=1)
+    cost = dm.between(t, city) + dm.between(city, nxt) - dm.between(t, nxt)
+    at = np.argmin(cost, axis=1)[:, None] + 1
+    pos = np.arange(n + 1)[None, :]
+    out = np.take_along_axis(t, np.minimum(np.where(pos < at, pos, pos - 1), n - 1), axis=1)
+    return np.where(pos == at, city, out)
+
+
+def drop_city(tours, city):
+    # Bỏ city khỏi từng tour (nối thẳng hai láng giềng của nó) và đánh lại chỉ số sau city
+    t = np.asarray(tours, dtype=np.int64)
+    out = t[t != city].reshape(len(t), -1)
+    return out - (out > city)
@@ -0,0 +1,198 @@
+import numpy as np
+
+# Lai ghép giữ cạnh cho GA (tour dạng list chỉ số thành phố):
+#   "ox"  - order crossover (cài trong GA)
+#   "erx" - edge recombination: con chỉ đi theo cạnh của cha / mẹ, ưu tiên cạnh chung và cạnh ngắn
+#   "eax" - edge assembly (dạng đơn giản, một AB-cycle): cha A đổi một chu trình cạnh xen kẽ A/B
+#           lấy cạnh của B, các chu trình con được nối lại qua danh sách ứng viên
+CROSSOVERS = ("ox", "erx", "eax")
+
+
+def _metric(dm):
+    m = dm.matrix
+    if m is not None:
+        return lambda a, b: m[a, b]
+    return lambda a, b: float(dm.between(a, b))
+
+
+def _nearest_unvisited(dm, cur, visited, cand):
+    if cand is not None:
+        for c in cand[cur]:
+            if not visited[c]:
+                return c
+    row = np.array(dm.row(cur), dtype=np.float64)
+    row[np.frombuffer(visited, dtype=np.uint8) == 1] = np.inf
+    return int(np.argmin(row))
+
+
+def erx(p1, p2, dm, rng, cand=None):
+    n = len(p1)
+    d = _metric(dm)
+    # Bảng cạnh: láng giềng -> số cha mẹ có cạnh đó (2 = cạnh chung)
+    adj = [{} for _ in range(n)]
+    for p in (p1, p2):
+        prev = p[-1]
+        for c in p:
+            adj[c][prev] = adj[c].get(prev, 0) + 1
+            adj[prev][c] = adj[prev].get(c, 0) + 1
+            prev = c
+    visited = bytearray(n)
+    cur = int(p1[int(rng.integers(n))])
+    child = [cur]
+    visited[cur] = 1
+    for _ in range(n - 1):
+        for v in adj[cur]:
+            del adj[v][cur]
+        nbrs = adj[cur]
+        if nbrs:
+            # Cạnh chung trước, rồi láng giềng còn ít cạnh nhất (ít bị kẹt về sau), hoà thì cạnh ngắn hơn
+            nxt = min(nbrs, key=lambda v: (-nbrs[v], len(adj[v]), d(cur, v)))
+        else:
+            nxt = _nearest_unvisited(dm, cur, visited, cand)
+        visited[nxt] = 1
+        child.append(nxt)
+        cur = nxt
+    return child
+
+
+def _neighbours(tour):
+    n = len(tour)
+    adj = [None] * n
+    for i, c in enumerate(tour):
+        adj[c] = [tour[i - 1], tour[(i + 1) % n]]
+    return adj
+
+
+def _ab_cycles(a_adj, b_adj, rng):
+    # Đi xen kẽ cạnh A / cạnh B (bỏ cạnh chung); khi đỉnh lặp lại cùng tính chẵn lẻ thì cắt ra một
+    # AB-cycle. Trả về list đỉnh [v0, v1, ..., v0], cạnh thứ chẵn thuộc A, thứ lẻ thuộc B
+    n = len(a_adj)
+    rest = ([[v for v in a_adj[u] if v not in b_adj[u]] for u in range(n)],
+            [[v for v in b_adj[u] if v not in a_adj[u]] for u in range(n)])
+    cycles = []
+    for s in rng.permutation(n).tolist():
+        while rest[0][s]:
+            path = [s]
+            pos = {(s, 0): 0}
+            while len(path) > 1 or rest[0][s]:
+                k = len(path) - 1
+                side = rest[k % 2]
+                cur = path[-1]
+                if not side[cur]:
+                    break
+                nxt = side[cur].pop(int(rng.integers(len(side[cur]))))
+                side[nxt].remove(cur)
+                path.append(nxt)
+                j = k + 1
+                i = pos.get((nxt, j % 2))
+                if i is None:
+                    pos[(nxt, j % 2)] = j
+                    continue
+                cyc = path[i:] if i % 2 == 0 else path[i + 1:] + [path[i + 1]]
+                cycles.append(cyc)
+                for t in range(i + 1, j):
+                    del pos[(path[t], t % 2)]
+                del path[i + 1:]
+    return cycles
+
+
+def _subtours(adj):
+    n = len(adj)
+    comp = [-1] * n
+    subs = {}
+    for s in range(n):
+        if comp[s] >= 0:
+            continue
+        members = []
+        prev, cur = adj[s][0], s
+        while True:
+            comp[cur] = s
+            members.append(cur)
+            a, b = adj[cur]
+            prev, cur = cur, (b if a == prev else a)
+            if cur == s:
+                break
+        subs[s] = members
+    return comp, subs
+
+
+def _merge_subtours(adj, comp, subs, d, dm, cand):
+    # Nối chu trình con nhỏ nhất vào chu trình khác bằng phép đổi 2 cạnh rẻ nhất:
+    # bỏ (u, u2), (v, v2), thêm (u, v), (u2, v2); v lấy trong danh sách ứng viên của u
+    cost = 0.0
+    while len(subs) > 1:
+        key = min(subs, key=lambda c: len(subs[c]))
+        sub = subs.pop(key)
+        best = None
+        for u in sub:
+            for u2 in adj[u]:
+                duu2 = d(u, u2)
+                for v in cand[u]:
+                    if comp[v] == key:
+                        continue
+                    for v2 in adj[v]:
+                        delta = d(u, v) + d(u2, v2) - duu2 - d(v, v2)
+                        if best is None or delta < best[0]:
+                            best = (delta, u, u2, v, v2)
+        if best is None:
+            # Mọi ứng viên đều nằm trong chu trình con: lấy đỉnh ngoài gần sub[0] nhất
+            u = sub[0]
+            row = np.array(dm.row(u), dtype=np.float64)
+            row[sub] = np.inf
+            v = int(np.argmin(row))
+            u2 = adj[u][0]
+            best = min((d(u, v) + d(u2, v2) - d(u, u2) - d(v, v2), u, u2, v, v2) for v2 in adj[v])
+        delta, u, u2, v, v2 = best
+        adj[u][adj[u].index(u2)] = v
+        adj[u2][adj[u2].index(u)] = v2
+        adj[v][adj[v].index(v2)] = u
+        adj[v2][adj[v2].index(v)] = u2
+        target = comp[v]
+        for x in sub:
+            comp[x] = target
+        subs[target].extend(sub)
+        cost += delta
+    return cost
+
+
+def _walk(adj):
+    tour = [0]
+    prev, cur = adj[0][0], 0
+    for _ in range(len(adj) - 1):
+        a, b = adj[cur]
+        prev, cur = cur, (b if a == prev else a)
+        tour.append(cur)
+    return tour
+
+
+def eax(p1, p2, dm, rng, cand, trials=5):
+    # EAX-1AB: thử tối đa trials AB-cycle (ngẫu nhiên), mỗi cycle cho một con từ p1; giữ con ngắn nhất
+    n = len(p1)
+    if n < 5:
+        return list(p1)
+    d = _metric(dm)
+    a_adj = _neighbours(p1)
+    b_adj = _neighbours(p2)
+    cycles = [c for c in _ab_cycles(a_adj, b_adj, rng) if len(c) > 3]
+    if not cycles:
+        return list(p1)
+    best, best_cost = None, 0.0
+    for k in rng.permutation(len(cycles))[:trials].tolist():
+        cyc = cycles[k]
+        adj = [x[:] for x in a_adj]
+        cost = 0.0
+        for t in range(0, len(cyc) - 1, 2):
+            u, v = cyc[t], cyc[t + 1]
+            adj[u].remove(v)
+            adj[v].remove(u)
+            cost -= d(u, v)
+        for t in range(1, len(cyc) - 1, 2):
+            u, v = cyc[t], cyc[t + 1]
+            adj[u].append(v)
+            adj[v].append(u)
+            cost += d(u, v)
+        comp, subs = _subtours(adj)
+        cost += _merge_subtours(adj, comp, subs, d, dm, cand)
+        if best is None or cost < best_cost:
+            best, best_cost = adj, cost
+    return _walk(best)
@@ -0,0 +1,192 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from algorithms.ga import GA
+from algorithms.aco import ACO
+from algorithms.construction import space_filling_curve, nearest_neighbour
+from algorithms.local_search import LocalSearch
+from utils.candidates import GridIndex, candidate_lists
+from utils.distance import DistanceMatrix
+from utils.history import History
+
+# Instance rất lớn (hàng chục nghìn thành phố): chia vùng -> giải từng cụm bằng GA / ACO song song ->
+# nối các tour con theo thứ tự cụm -> local search chỉ bật quanh ranh giới cụm để sửa chỗ nối.
+# Mỗi cụm có kích thước cố định nên tổng thời gian tăng gần tuyến tính theo n
+PARTITIONS = ("sfc", "kmeans")
+CLUSTER_SOLVERS = {"ga": GA, "aco": ACO}
+ITER_PARAM = {"ga": "generations", "aco": "n_iter"}
+MIN_CLUSTER = 8  # Cụm nhỏ hơn chỉ dựng tour láng giềng gần, không chạy solver
+
+
+def _points(cities):
+    return np.asarray(cities, dtype=np.float64).reshape(-1, 2)
+
+
+def _kmeans(pts, k, iters):
+    # Lloyd xấp xỉ: tâm khởi tạo rải đều dọc đường cong Hilbert; mỗi điểm chỉ so với tâm hiện tại
+    # và các tâm láng giềng của nó -> O(n) mỗi vòng thay vì O(n k)
+    order = np.asarray(space_filling_curve(pts))
+    centers = pts[order[(np.arange(k) * len(pts)) // k]]
+    labels = np.empty(len(pts), dtype=np.int64)
+    labels[order] = (np.arange(len(pts)) * k) // len(pts)
+    for _ in range(iters):
+        near = np.column_stack([np.arange(k), GridIndex(centers).knn(min(8, k - 1))]) if k > 1 \
+            else np.zeros((1, 1), dtype=np.int64)
+        cand = near[labels]
+        d = np.hypot(pts[:, None, 0] - centers[cand, 0], pts[:, None, 1] - centers[cand, 1])
+        new = cand[np.arange(len(pts)), np.argmin(d, axis=1)]
+        counts = np.bincount(new, minlength=k)
+        sums = np.column_stack([np.bincount(new, pts[:, 0], k), np.bincount(new, pts[:, 1], k)])
+        alive = counts > 0
+        centers[alive] = sums[alive] / counts[alive, None]
+        if np.array_equal(new, labels):
+            break
+        labels = new
+    return labels, centers
+
+
+def partition(cities, cluster_size=200, method="sfc", iters=10):
+    # Danh sách mảng chỉ số, mỗi mảng một cụm, theo thứ tự đi qua các cụm
+    if method not in PARTITIONS:
+        raise ValueError(f"partition phải là một trong {PARTITIONS}, không phải {method!r}")
+    pts = _points(cities)
+    n = len(pts)
+    k = max(1, int(round(n / cluster_size)))
+    if method == "sfc":
+        # Cắt thứ tự Hilbert thành k đoạn liên tiếp: cụm kề nhau trên đường cong cũng kề nhau trong mặt phẳng
+        return np.array_split(np.asarray(space_filling_curve(pts), dtype=np.int64), k)
+    labels, centers = _kmeans(pts, k, iters)
+    order = np.argsort(labels, kind="stable")
+    starts = np.searchsorted(labels[order], np.arange(k + 1))
+    groups = [order[starts[c]:starts[c + 1]] for c in range(k)]
+    return [groups[c] for c in space_filling_curve(centers) if len(groups[c])]
+
+
+def _solve_cluster(job):
+    # Chạy trong process pool: chỉ toạ độ của cụm được pickle; trả về tour theo chỉ số cục bộ
+    pts = job["points"]
+    if len(pts) < MIN_CLUSTER:
+        return nearest_neighbour(pts)
+    params = dict(job["params"])
+    params[ITER_PARAM[job["solver"]]] = job["iterations"]
+    solver = CLUSTER_SOLVERS[job["solver"]](pts, seed=job["seed"], **params)
+    tour = None
+    start = time.perf_counter()
+    for _, tour, _, _ in solver.run_stepwise():
+        if job["time_limit"] is not None and time.perf_counter() - start >= job["time_limit"]:
+            break
+    return [int(c) for c in tour]
+
+
+def stitch(cities, cycles):
+    # Mỗi tour con (chỉ số toàn cục) bị cắt một cạnh thành đường đi rồi nối vào đuôi đường trước đó:
+    # chọn điểm vào + chiều đi sao cho cạnh nối ngắn, cạnh bị cắt dài, điểm ra gần tâm cụm kế tiếp
+    pts = _points(cities)
+    centroids = [pts[c].mean(axis=0) for c in cycles]
+    prev = centroids[-1]
+    out = []
+    for i, cyc in enumerate(cycles):
+        cyc = np.asarray(cyc, dtype=np.int64)
+        m = len(cyc)
+        if m < 3:
+            path = cyc
+        else:
+            pc = pts[cyc]
+            nxt_ref = centroids[(i + 1) % len(cycles)]
+            d_in = np.hypot(pc[:, 0] - prev[0], pc[:, 1] - prev[1])
+            d_out = np.hypot(pc[:, 0] - nxt_ref[0], pc[:, 1] - nxt_ref[1])
+            succ = np.roll(pc, -1, axis=0)
+            edge = np.hypot(pc[:, 0] - succ[:, 0], pc[:, 1] - succ[:, 1])  # cạnh (k, k + 1)
+            # Xuôi từ k: bỏ cạnh (k - 1, k), ra ở k - 1; ngược từ k: bỏ cạnh (k, k + 1), ra ở k + 1
+            fwd = d_in - np.roll(edge, 1) + np.roll(d_out, 1)
+            bwd = d_in - edge + np.roll(d_out, -1)
+            kf, kb = int(np.argmin(fwd)), int(np.argmin(bwd))
+            if fwd[kf] <= bwd[kb]:
+                path = np.roll(cyc, -kf)
+            else:
+                path = np.roll(cyc[::-1], -(m - 1 - kb))
+        out.append(path)
+        prev = pts[path[-1]]
+    return np.concatenate(out).tolist()
+
+
+def boundary_cities(labels, cand):
+    # Thành phố có láng giềng gần thuộc cụm khác: chỗ tour con bị nối / chỗ cạnh tốt bị chia cắt
+    return np.flatnonzero((labels[cand] != labels[:, None]).any(axis=1))
+
+
+class Decomposition:
+    # Chia để trị cho instance lớn; solver / params: GA hoặc ACO chạy trên từng cụm (iterations vòng,
+    # tối đa time_limit giây mỗi cụm), workers process song song; repair_time giới hạn bước sửa ranh giới
+    def __init__(self, cities, solver="aco", cluster_size=200, partition="sfc", iterations=100, time_limit=None,
+                 workers=1, repair=True, repair_time=None, candidates=10, seed=None, history=None, **params):
+        if solver not in CLUSTER_SOLVERS:
+            raise ValueError(f"solver phải là một trong {tuple(CLUSTER_SOLVERS)}, không phải {solver!r}")
+        if partition not in PARTITIONS:
+            raise ValueError(f"partition phải là một trong {PARTITIONS}, không phải {partition!r}")
+        self.cities = cities
+        self.n = len(cities)
+        self.solver = solver
+        self.cluster_size = cluster_size
+        self.partition = partition
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.workers = workers
+        self.repair = repair
+        self.repair_time = repair_time
+        self.candidates = candidates
+        self.params = params
+        self.seed = seed
+        self.history = History.make(history)
+        self.dm = DistanceMatrix(cities, lazy=True)
+        self.clusters = None
+        self.timings = {}
+
+    def _jobs(self, pts):
+        seeds = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(self.seed).spawn(len(self.clusters))]
+        return [{"points": pts[c], "solver": self.solver, "params": self.params, "iterations": self.iterations,
+                 "time_limit": self.time_limit, "seed": s} for c, s in zip(self.clusters, seeds)]
+
+    def _solve(self, jobs):
+        if self.workers <= 1:
+            return [_solve_cluster(job) for job in jobs]
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            return list(pool.map(_solve_cluster, jobs, chunksize=max(1, len(jobs) // (4 * self.workers))))
+
+    def run_stepwise(self):
+        # Bước 0: tour sau khi nối; bước 1: sau khi sửa ranh giới
+        pts = _points(self.cities)
+        try:
+            t = time.perf_counter()
+            self.clusters = partition(pts, self.cluster_size, self.partition)
+            self.timings["partition"] = time.perf_counter() - t
+
+            t = time.perf_counter()
+            local = self._solve(self._jobs(pts))
+            self.timings["solve"] = time.perf_counter() - t
+
+            t = time.perf_counter()
+            tour = stitch(pts, [c[np.asarray(lt, dtype=np.int64)] for c, lt in zip(self.clusters, local)])
+            length = self.dm.tour_length(tour)
+            self.timings["stitch"] = time.perf_counter() - t
+            self.history.record(0, length)
+            yield 0, tour, length, True
+            if not self.repair or self.n < 5:
+                return
+
+            t = time.perf_counter()
+            cand = candidate_lists(pts, self.candidates)
+            labels = np.empty(self.n, dtype=np.int64)
+            for c, idx in enumerate(self.clusters):
+                labels[idx] = c
+            ls = LocalSearch(pts, candidates=cand, time_limit=self.repair_time)
+            repaired = ls.improve(tour, active=boundary_cities(labels, cand))
+            repaired_len = self.dm.tour_length(repaired)
+            self.timings["repair"] = time.perf_counter() - t
+            improved = repaired_len < length
+            if improved:
+                tour, length = repaired, repaired_len
+            self.history.record(1, length)
+            yield 1, tour, length, improved
+        finally:
+            self.history.close()
@@ -0,0 +1,51 @@
+import numpy as np
+from utils.candidates import insert_candidates, delete_candidates
+
+
+class DynamicInstance:
+    # TSP động cho GA / ACO: thêm / bỏ thành phố giữa các bước rồi tối ưu tiếp từ trạng thái hiện tại.
+    # Phần chung (toạ độ, ma trận khoảng cách, danh sách ứng viên, local search) cập nhật ở đây;
+    # lớp con sửa trạng thái riêng (quần thể, pheromone...) trong _city_added / _city_removed,
+    # nhận kèm danh sách ứng viên cũ để ánh xạ lại dữ liệu dạng thưa
+    def add_city(self, p):
+        j = self.n
+        p = tuple(p)
+        self.cities = list(self.cities) + [p]
+        self.n += 1
+        # DistanceMatrix / LocalSearch dùng chung với solver khác có thể đã được cập nhật trước
+        if self.dm.n < self.n:
+            self.dm.add_point(p)
+        old_cand = self.cand
+        if self.cand is not None:
+            self.cand = insert_candidates(self.cand, self.dm.points)
+        if self.local_search is not None and self.local_search.n < self.n:
+            self.local_search.add_city(p)
+        self._city_added(j, old_cand)
+        return j
+
+    def remove_city(self, i):
+        # Các thành phố sau i lùi chỉ số đi 1 (giống list.pop)
+        if not 0 <= i < self.n:
+            raise ValueError(f"không có thành phố {i} (n = {self.n})")
+        if self.n <= 3:
+            raise ValueError("cần giữ lại ít nhất 3 thành phố")
+        self.cities = list(self.cities)
+        del self.cities[i]
+        self.n -= 1
+        if self.dm.n > self.n:
+            self.dm.remove_point(i)
+        old_cand = self.cand
+        if self.cand is not None:
+            self.cand = delete_candidates(self.cand, self.dm.points, i)
+        if self.local_search is not None and self.local_search.n > self.n:
+            self.local_search.remove_city(i)
+        self._city_removed(i, old_cand)
+
+
+def remap_sparse(old_cand, old_values, new_cand, fill):
+    # Dạng thưa n x k: giá trị của cạnh (r, c) theo danh sách mới lấy từ vị trí của c trong hàng cũ;
+    # cạnh mới vào danh sách nhận fill. old_cand đã được đánh lại chỉ số, -1 = không còn
+    eq = old_cand[:, None, :] == new_cand[:, :, None]
+    hit = eq.any(axis=2)
+    picked = np.take_along_axis(old_values, eq.argmax(axis=2), axis=1)
+    return np.where(hit, picked, fill)
@@ -1,24 +1,105 @@
 import random
 import copy
-from utils.tsp_utils import total_distance
+import numpy as np
+from utils.distance import DistanceMatrix
+from utils.candidates import candidate_lists
+from utils.fitness import FitnessCache
+from algorithms.local_search import LocalSearch
+from algorithms.construction import initial_tours, cheapest_insertion, drop_city
+from algorithms.crossover import CROSSOVERS, erx, eax
+from utils import checkpoint
+from utils.history import History
+from utils.profiling import Profiler
+from utils.diversity import edge_diversity
+from algorithms.observer import Observable
+from algorithms.dynamic import DynamicInstance
 
-class GA:
-    def __init__(self, cities, pop_size=50, generations=500, mutation_rate=0.05, patience=200):
+SELECTIONS = ("random", "tournament", "rank")
+REPLACEMENTS = ("generational", "steady_state")
+
+class GA(Observable, DynamicInstance):
+    def __init__(self, cities, pop_size=50, generations=500, mutation_rate=0.05, patience=200, dist=None,
+                 candidates=None, engine="list", mutation="swap", seed=None,
+                 local_search=None, ls_target="elite", checkpoint_path=None, checkpoint_every=0, history=None,
+                 profile=False, init=None, init_fraction=0.1, converge_threshold=None, converge_action="stop",
+                 converge_every=10, restart_fraction=0.5, selection="random", tournament_size=3, rank_pressure=1.5,
+                 replacement="generational", crossover="ox"):
+        if selection not in SELECTIONS:
+            raise ValueError(f"selection phải là một trong {SELECTIONS}, không phải {selection!r}")
+        if not 1 <= rank_pressure <= 2:
+            raise ValueError(f"rank_pressure phải nằm trong [1, 2], không phải {rank_pressure!r}")
+        if replacement not in REPLACEMENTS:
+            raise ValueError(f"replacement phải là một trong {REPLACEMENTS}, không phải {replacement!r}")
+        if crossover not in CROSSOVERS:
+            raise ValueError(f"crossover phải là một trong {CROSSOVERS}, không phải {crossover!r}")
         self.cities = cities
         self.n = len(cities)
         self.pop_size = pop_size
         self.generations = generations
         self.mutation_rate = mutation_rate
         self.patience = patience
-        self.history = []
+        self.engine = engine  # "list": từng cá thể là list Python; "numpy": cả quần thể là mảng (pop_size, n)
+        self.mutation = mutation  # "swap" hoặc "inversion"
+        # Chọn cha mẹ: "random" (không áp lực chọn lọc), "tournament" (tốt nhất trong tournament_size cá thể),
+        # "rank" (xếp hạng tuyến tính, cá thể tốt nhất được chọn gấp rank_pressure lần trung bình, 1..2)
+        self.selection = selection
+        self.tournament_size = tournament_size
+        self.rank_pressure = rank_pressure
+        # "generational": thay cả quần thể mỗi thế hệ; "steady_state": từng con thay cá thể tệ nhất nếu tốt hơn
+        self.replacement = replacement
+        self.crossover = crossover  # "ox", "erx" hoặc "eax" (xem algorithms.crossover)
+        self._xcand = None
+        self.rng = np.random.default_rng(seed)
+        self.random = random.Random(seed)  # Cho các nhánh viết bằng list Python; không đụng tới module random
+        # Lịch sử hội tụ: tên policy hoặc một utils.history.History đã cấu hình (ring, ghi dần ra file...)
+        self.history = History.make(history)
+        # Danh sách láng giềng gần (k hoặc mảng n x k) cho đột biến có định hướng
+        if candidates is None:
+            self.cand = None
+        elif np.isscalar(candidates):
+            self.cand = candidate_lists(cities, candidates)
+        else:
+            self.cand = np.asarray(candidates, dtype=np.int32)
+        # Có danh sách ứng viên thì không cần ma trận n x n: khoảng cách tính theo hàng / cặp khi cần
+        self.dm = dist if dist is not None else DistanceMatrix(cities, lazy=self.cand is not None)
+        self.fitness = FitnessCache(self.dm, maxsize=4 * pop_size)
+        # Bước memetic: local_search=True hoặc một LocalSearch đã cấu hình (ngân sách, loại move)
+        if local_search is True:
+            local_search = LocalSearch(cities, candidates=self.cand if self.cand is not None else 10)
+        self.local_search = local_search
+        self._ls_evaluated = 0  # Tour được tính lại độ dài sau local search (ngoài FitnessCache)
+        self.ls_target = ls_target  # "elite": chỉ cá thể tốt nhất thế hệ; "offspring": mọi cá thể con
+        # Gieo init_fraction quần thể ban đầu bằng tour heuristic ("nn", "greedy", "sfc" hoặc tuple; True = cả ba)
+        self.init = ("nn", "greedy", "sfc") if init is True else init
+        self.init_fraction = init_fraction
+        # Lưu trạng thái ra checkpoint_path (.npz) sau mỗi checkpoint_every thế hệ (0 = tắt)
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self._resume = False
+        # Đo thời gian từng pha + bộ đếm (tắt mặc định); đọc qua stats()
+        self.profiler = Profiler.make(profile)
+        # Độ đa dạng cạnh của quần thể < converge_threshold -> dừng sớm hoặc thay restart_fraction cá thể tệ nhất
+        self._setup_convergence(converge_threshold, converge_action, converge_every, restart_fraction)
+        self._setup_events()
 
     def _create_individual(self):
         path = list(range(self.n))
-        random.shuffle(path)
+        self.random.shuffle(path)
         return path
 
+    def _edge_candidates(self):
+        # Danh sách ứng viên dạng list cho ERX / EAX; không có sẵn self.cand thì tự dựng (k = 10)
+        if self._xcand is None:
+            cand = self.cand if self.cand is not None else candidate_lists(self.cities, 10)
+            self._xcand = np.asarray(cand).tolist()
+        return self._xcand
+
     def _crossover(self, p1, p2):
-        a, b = sorted(random.sample(range(self.n), 2))
+        if self.crossover == "erx":
+            return erx(p1, p2, self.dm, self.rng, self._edge_candidates())
+        if self.crossover == "eax":
+            return eax(p1, p2, self.dm, self.rng, self._edge_candidates())
+        a, b = sorted(self.random.sample(range(self.n), 2))
         child = [-1] * self.n
         child[a:b] = p1[a:b]
         ptr = 0
@@ -30,44 +111,338 @@ class GA:
         return child
 
     def _mutate(self, ind):
-        if random.random() < self.mutation_rate:
-            i, j = random.sample(range(self.n), 2)
-            ind[i], ind[j] = ind[j], ind[i]
-
-    def run_stepwise(self):
-        pop = [self._create_individual() for _ in range(self.pop_size)]
-        best = min(pop, key=lambda x: total_distance(x, self.cities))
-        best_dist = total_distance(best, self.cities)
-        
-        no_improve = 0
-
-        for gen in range(self.generations):
-            if no_improve >= self.patience:
-                yield gen, list(best), best_dist, False
-                break
-
-            new_pop = []
-            new_pop.append(list(best)) # Elitism
-            
-            while len(new_pop) < self.pop_size:
-                p1 = random.choice(pop)
-                p2 = random.choice(pop)
-                child = self._crossover(p1, p2)
-                self._mutate(child)
-                new_pop.append(child)
-
-            pop = new_pop
-            current_best = min(pop, key=lambda x: total_distance(x, self.cities))
-            current_dist = total_distance(current_best, self.cities)
-
-            improved = False
-            if current_dist < best_dist:
-                best = current_best
-                best_dist = current_dist
-                no_improve = 0
-                improved = True
+        if self.random.random() < self.mutation_rate:
+            if self.cand is not None:
+                # Đảo đoạn để đặt một thành phố cạnh láng giềng gần của nó (bước 2-opt ngẫu nhiên)
+                i = self.random.randrange(self.n)
+                j = ind.index(int(self.random.choice(self.cand[ind[i]])))
+                if i < j:
+                    ind[i + 1:j + 1] = ind[i + 1:j + 1][::-1]
+                else:
+                    ind[j:i] = ind[j:i][::-1]
+                return
+            i, j = self.random.sample(range(self.n), 2)
+            if self.mutation == "inversion":
+                i, j = min(i, j), max(i, j)
+                ind[i:j + 1] = ind[i:j + 1][::-1]
+            else:
+                ind[i], ind[j] = ind[j], ind[i]
+
+    def _random_population(self):
+        return np.argsort(self.rng.random((self.pop_size, self.n)), axis=1).astype(np.int32)
+
+    def _crossover_batch(self, p1, p2):
+        # OX cho cả lô: giữ đoạn [a, b) của p1, phần còn lại điền theo thứ tự của p2
+        m, n = p1.shape
+        rows = np.arange(m)[:, None]
+        a = self.rng.integers(0, n, m)
+        b = self.rng.integers(0, n - 1, m)
+        b += b >= a
+        lo, hi = np.minimum(a, b), np.maximum(a, b)
+
+        pos = np.arange(n)
+        in_seg = (pos >= lo[:, None]) & (pos < hi[:, None])
+        member = np.zeros((m, n), dtype=bool)
+        member[rows, p1] = in_seg
+        keep = ~member[rows, p2]
+
+        # Vị trí p2 được giữ (theo thứ tự) -> các ô trống của con (theo thứ tự)
+        src = np.argsort(~keep, axis=1, kind="stable")
+        dst = np.argsort(in_seg, axis=1, kind="stable")
+        child = np.empty_like(p1)
+        child[rows, dst] = p2[rows, src]
+        child[in_seg] = p1[in_seg]
+        return child
+
+    def _mutate_batch(self, pop):
+        m, n = pop.shape
+        hit = np.flatnonzero(self.rng.random(m) < self.mutation_rate)
+        if len(hit) == 0:
+            return
+        sub = pop[hit]
+        i = self.rng.integers(0, n, len(hit))
+        if self.cand is not None:
+            # Giống _mutate: đảo đoạn để thành phố ở vị trí i đứng cạnh một láng giềng gần
+            v = self.cand[sub[np.arange(len(hit)), i], self.rng.integers(0, self.cand.shape[1], len(hit))]
+            j = np.argmax(sub == v[:, None], axis=1)
+            lo = np.where(i < j, i + 1, j)
+            hi = np.where(i < j, j, i - 1)
+        else:
+            j = self.rng.integers(0, n - 1, len(hit))
+            j += j >= i
+            if self.mutation != "inversion":
+                r = np.arange(len(hit))
+                sub[r, i], sub[r, j] = sub[r, j], sub[r, i]
+                pop[hit] = sub
+                return
+            lo, hi = np.minimum(i, j), np.maximum(i, j)
+
+        pos = np.arange(n)
+        seg = (pos >= lo[:, None]) & (pos <= hi[:, None])
+        idx = np.where(seg, lo[:, None] + hi[:, None] - pos, pos)
+        pop[hit] = np.take_along_axis(sub, idx, axis=1)
+
+    def _select(self, count):
+        # count chỉ số cha mẹ theo self.fit (ngắn hơn = tốt hơn)
+        size = len(self.fit)
+        if self.selection == "tournament":
+            idx = self.rng.integers(0, size, (count, self.tournament_size))
+            return idx[np.arange(count), np.argmin(np.asarray(self.fit)[idx], axis=1)]
+        if self.selection == "rank":
+            # Hạng r = 0 (tệ nhất) .. size - 1 (tốt nhất): p = (2 - s) / size + 2r(s - 1) / (size(size - 1))
+            s = self.rank_pressure
+            r = np.arange(size)
+            p = (2 - s) / size + 2 * r * (s - 1) / (size * max(size - 1, 1))
+            order = np.argsort(self.fit, kind="stable")[::-1]
+            return order[self.rng.choice(size, count, p=p / p.sum())]
+        return self.rng.integers(0, size, count)
+
+    def _individual(self, pop, k):
+        return pop[k].tolist() if self.engine == "numpy" else pop[k]
+
+    def _apply_local_search(self, pop, fit, best_dist):
+        if self.ls_target == "offspring":
+            idx = range(len(pop))
+        else:
+            # Chỉ tối ưu cá thể sắp trở thành best mới; cá thể ưu tú cũ đã được tối ưu trước đó
+            k = int(np.argmin(fit))
+            idx = [k] if fit[k] < best_dist else []
+        for i in idx:
+            tour = self.local_search.improve(pop[i])
+            pop[i] = tour if self.engine == "list" else np.asarray(tour, dtype=np.int32)
+            fit[i] = self.dm.tour_length(tour)
+            self._ls_evaluated += 1
+        return fit
+
+    def _breed(self, pop, best):
+        if self.engine == "numpy":
+            m = self.pop_size - 1
+            p1 = pop[self._select(m)]
+            p2 = pop[self._select(m)]
+            t = self.profiler.tic()
+            if self.crossover == "ox":
+                children = self._crossover_batch(p1, p2)
+            else:
+                children = np.array([self._crossover(a, b) for a, b in zip(p1.tolist(), p2.tolist())],
+                                    dtype=np.int32)
+            self.profiler.toc("crossover", t)
+            t = self.profiler.tic()
+            self._mutate_batch(children)
+            self.profiler.toc("mutation", t)
+            self.profiler.count("crossovers", m)
+            return np.vstack([np.asarray(best, dtype=np.int32)[None], children])
+
+        new_pop = []
+        new_pop.append(list(best)) # Elitism
+
+        pairs = None if self.selection == "random" else self._select(2 * (self.pop_size - 1)).reshape(-1, 2)
+        while len(new_pop) < self.pop_size:
+            if pairs is None:
+                p1 = self.random.choice(pop)
+                p2 = self.random.choice(pop)
             else:
-                no_improve += 1
+                i, j = pairs[len(new_pop) - 1]
+                p1, p2 = pop[i], pop[j]
+            t = self.profiler.tic()
+            child = self._crossover(p1, p2)
+            self.profiler.toc("crossover", t)
+            t = self.profiler.tic()
+            self._mutate(child)
+            self.profiler.toc("mutation", t)
+            new_pop.append(child)
+        self.profiler.count("crossovers", self.pop_size - 1)
+        return new_pop
+
+    def _steady_state(self):
+        # pop_size - 1 con mỗi bước (cùng số lần đánh giá với một thế hệ); con thay cá thể tệ nhất nếu ngắn hơn
+        # và chưa có cá thể cùng độ dài (tránh quần thể đầy bản sao) -> cá thể tốt nhất không bao giờ bị thay
+        for _ in range(self.pop_size - 1):
+            i, j = self._select(2)
+            t = self.profiler.tic()
+            child = self._crossover(list(self._individual(self.pop, i)), list(self._individual(self.pop, j)))
+            self.profiler.toc("crossover", t)
+            t = self.profiler.tic()
+            self._mutate(child)
+            self.profiler.toc("mutation", t)
+            t = self.profiler.tic()
+            length = float(self.fitness.evaluate([child])[0])
+            self.profiler.toc("evaluate", t)
+            if self.local_search is not None and (self.ls_target == "offspring" or length < self.best_dist):
+                t = self.profiler.tic()
+                child = self.local_search.improve(child)
+                length = self.dm.tour_length(child)
+                self._ls_evaluated += 1
+                self.profiler.toc("local_search", t)
+            w = int(np.argmax(self.fit))
+            if length < self.fit[w] and not np.any(self.fit == length):
+                self.pop[w] = child if self.engine == "list" else np.asarray(child, dtype=np.int32)
+                self.fit[w] = length
+        self.profiler.count("crossovers", self.pop_size - 1)
+
+    def _init_run(self):
+        if self.engine == "numpy":
+            self.pop = self._random_population()
+        else:
+            self.pop = [self._create_individual() for _ in range(self.pop_size)]
+        if self.init:
+            count = min(self.pop_size, max(1, int(round(self.init_fraction * self.pop_size))))
+            for i, tour in enumerate(initial_tours(self.cities, count, self.rng, self.init, self.cand)):
+                self.pop[i] = tour if self.engine == "list" else np.asarray(tour, dtype=np.int32)
+        self.fit = self.fitness.evaluate(self.pop)
+        if self.local_search is not None:
+            self.fit = self._apply_local_search(self.pop, self.fit, float("inf"))
+        k = int(np.argmin(self.fit))
+        self.best = self._individual(self.pop, k)
+        self.best_dist = float(self.fit[k])
+        self.no_improve = 0
+        self.gen = 0
+
+    def step(self):
+        # Một thế hệ; trạng thái nằm trên self để có thể can thiệp giữa các bước (di cư, checkpoint...)
+        if self.replacement == "steady_state":
+            self._steady_state()
+        else:
+            self.pop = self._breed(self.pop, self.best)
+            # Một lần gather-and-sum cho cả quần thể; cá thể ưu tú không bị tính lại
+            t = self.profiler.tic()
+            self.fit = self.fitness.evaluate(self.pop)
+            self.profiler.toc("evaluate", t)
+            if self.local_search is not None:
+                t = self.profiler.tic()
+                self.fit = self._apply_local_search(self.pop, self.fit, self.best_dist)
+                self.profiler.toc("local_search", t)
+        self.profiler.count("generations")
+        k = int(np.argmin(self.fit))
+        current_dist = float(self.fit[k])
+
+        improved = False
+        if current_dist < self.best_dist:
+            self.best = self._individual(self.pop, k)
+            self.best_dist = current_dist
+            self.no_improve = 0
+            improved = True
+        else:
+            self.no_improve += 1
+
+        self.history.record(self.gen, self.best_dist)
+        self.gen += 1
+        self._check_convergence()
+        return improved
+
+    def _convergence_metric(self):
+        return edge_diversity(self.pop)
+
+    def _partial_restart(self):
+        # Giữ các cá thể tốt, thay phần tệ nhất bằng cá thể ngẫu nhiên (cá thể ưu tú luôn được giữ)
+        m = min(int(self.restart_fraction * self.pop_size), self.pop_size - 1)
+        if m <= 0:
+            return
+        worst = np.argsort(self.fit)[::-1][:m]
+        if self.engine == "numpy":
+            self.pop[worst] = np.argsort(self.rng.random((m, self.n)), axis=1)
+        else:
+            for i in worst:
+                self.pop[i] = self._create_individual()
+        self.fit[worst] = self.fitness.evaluate([self.pop[i] for i in worst])
+
+    def inject(self, tours):
+        # Thay các cá thể tệ nhất bằng tours (vd. cá thể di cư từ đảo khác)
+        tours = [list(t) for t in tours]
+        if not tours:
+            return
+        lengths = self.fitness.evaluate(tours)
+        worst = np.argsort(self.fit)[::-1][:len(tours)]
+        for i, tour, length in zip(worst, tours, lengths):
+            self.pop[i] = tour if self.engine == "list" else np.asarray(tour, dtype=np.int32)
+            self.fit[i] = length
+            if length < self.best_dist:
+                self.best = tour
+                self.best_dist = float(length)
+                self.no_improve = 0
+
+    def top(self, count):
+        # count cá thể tốt nhất hiện tại (dạng list)
+        return [list(self._individual(self.pop, int(i))) for i in np.argsort(self.fit)[:count]]
+
+    def _repaired(self, pop, best):
+        # Sau khi thêm / bỏ thành phố: tính lại fitness, best có thể đổi vì độ dài mọi tour đều đổi
+        self.pop = pop.astype(np.int32) if self.engine == "numpy" else pop.tolist()
+        self.fit = self.fitness.evaluate(self.pop)
+        self.best = best[0].tolist()
+        self.best_dist = self.dm.tour_length(self.best)
+        k = int(np.argmin(self.fit))
+        if self.fit[k] < self.best_dist:
+            self.best = self._individual(self.pop, k)
+            self.best_dist = float(self.fit[k])
+        self.no_improve = 0
+
+    def _city_added(self, j, old_cand):
+        self.fitness.clear()
+        self._xcand = None
+        if getattr(self, "pop", None) is None:
+            return
+        # Chèn thành phố mới vào mỗi cá thể ở vị trí rẻ nhất
+        self._repaired(cheapest_insertion(self.pop, j, self.dm), cheapest_insertion([self.best], j, self.dm))
+
+    def _city_removed(self, i, old_cand):
+        self.fitness.clear()
+        self._xcand = None
+        if getattr(self, "pop", None) is None:
+            return
+        self._repaired(drop_city(self.pop, i), drop_city([self.best], i))
+
+    def stats(self):
+        # Ảnh chụp số liệu đo; cache fitness và local search vốn có bộ đếm riêng nên luôn có mặt
+        snap = self.profiler.snapshot()
+        snap["counters"].update(tour_evaluations=self.fitness.misses + self._ls_evaluated,
+                                cache_hits=self.fitness.hits)
+        snap["convergence"] = {"edge_diversity": self.convergence, "restarts": self.restarts}
+        if self.local_search is not None:
+            snap["counters"]["ls_moves"] = self.local_search.moves
+            snap["counters"]["ls_evaluations"] = self.local_search.evaluations
+        return snap
+
+    def save_checkpoint(self, path=None):
+        path = path or self.checkpoint_path
+        meta = {
+            "solver": "ga",
+            "n": self.n,
+            "engine": self.engine,
+            "gen": self.gen,
+            "no_improve": self.no_improve,
+            "best_dist": self.best_dist,
+            "rng": checkpoint.rng_state(self.rng, self.random),
+            "history": self.history.state(),
+        }
+        self.history.flush()
+        checkpoint.save(path, meta,
+                        pop=np.asarray(self.pop, dtype=np.int32),
+                        fit=np.asarray(self.fit, dtype=np.float64),
+                        best=np.asarray(self.best, dtype=np.int32),
+                        history=self.history.to_array())
+
+    def load_checkpoint(self, path=None):
+        # Khôi phục trạng thái; lần gọi run / run_stepwise kế tiếp chạy tiếp từ thế hệ đã lưu
+        meta, arrays = checkpoint.load(path or self.checkpoint_path)
+        if meta.get("solver") != "ga" or meta["n"] != self.n:
+            raise ValueError(f"checkpoint không khớp: {meta.get('solver')} với {meta.get('n')} thành phố")
+        pop = arrays["pop"]
+        self.pop = pop if self.engine == "numpy" else pop.tolist()
+        self.fit = arrays["fit"]
+        self.best = arrays["best"].tolist()
+        self.best_dist = meta["best_dist"]
+        self.gen = meta["gen"]
+        self.no_improve = meta["no_improve"]
+        self.history.restore(arrays["history"], meta.get("history"))
+        checkpoint.restore_rng(self.rng, meta["rng"], self.random)
+        self._resume = True
+
+    def _iteration(self):
+        return self.gen
+
+    def _limit(self):
+        return self.generations
 
-            self.history.append((gen, best_dist))
-            yield gen, list(best), best_dist, improved
\ No newline at end of file
+    def _best(self):
+        # self.best không bị sửa tại chỗ (elitism sao chép khi lai) -> trả thẳng, không cần list(...)
+        return self.best, self.best_dist
@@ -0,0 +1,133 @@
+import multiprocessing as mp
+import numpy as np
+from algorithms.ga import GA
+from utils.distance import DistanceMatrix
+from utils.shared import SharedArray
+from utils.history import History
+
+
+def _island_main(conn, points_spec, dist_spec, ga_kwargs, seed):
+    # Mỗi đảo: gắn vào toạ độ + ma trận khoảng cách dùng chung (không pickle), tiến hoá m thế hệ mỗi lượt
+    points = SharedArray.attach(points_spec)
+    dist = SharedArray.attach(dist_spec)
+    try:
+        dm = DistanceMatrix.from_array(points.array, dist.array)
+        # Lịch sử riêng của từng đảo không dùng tới (process chính tự gộp) -> chỉ giữ 1 điểm
+        ga = GA(points.array, dist=dm, seed=seed, history=History("ring", capacity=1), **ga_kwargs)
+        ga._init_run()
+        reported = None
+        while True:
+            msg = conn.recv()
+            if msg[0] == "stop":
+                break
+            _, m, immigrants, n_migrants = msg
+            if immigrants:
+                ga.inject(immigrants)
+            per_gen = []
+            for _ in range(m):
+                ga.step()
+                per_gen.append(ga.best_dist)
+            best = None
+            if reported is None or ga.best_dist < reported:
+                best = list(ga.best)
+                reported = ga.best_dist
+            conn.send((per_gen, best, ga.best_dist, ga.top(n_migrants)))
+    finally:
+        # Bỏ tham chiếu tới bộ nhớ dùng chung trước khi đóng
+        dm = ga = None
+        points.close()
+        dist.close()
+        conn.close()
+
+
+class IslandGA:
+    # K quần thể con tiến hoá song song trên K process; cứ migration_interval thế hệ thì trao đổi cá thể tốt
+    def __init__(self, cities, n_islands=4, migration_interval=20, migrants=2, topology="ring",
+                 generations=500, patience=200, seed=None, dist=None, history=None, **ga_kwargs):
+        if topology not in ("ring", "random"):
+            raise ValueError(f"topology phải là 'ring' hoặc 'random', không phải {topology!r}")
+        self.cities = cities
+        self.n = len(cities)
+        self.n_islands = n_islands
+        self.migration_interval = migration_interval
+        self.migrants = migrants
+        self.topology = topology
+        self.generations = generations
+        self.patience = patience
+        self.ga_kwargs = ga_kwargs
+        self.rng = np.random.default_rng(seed)
+        self.seeds = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(n_islands)]
+        self.dm = dist if dist is not None else DistanceMatrix(cities)
+        self.history = History.make(history)
+
+    def _targets(self):
+        k = self.n_islands
+        if self.topology == "ring":
+            return [(i + 1) % k for i in range(k)]
+        # Hoán vị ngẫu nhiên không có điểm bất động: không đảo nào gửi cho chính nó
+        while True:
+            perm = self.rng.permutation(k)
+            if k < 2 or np.all(perm != np.arange(k)):
+                return perm.tolist()
+
+    def run_stepwise(self):
+        points = SharedArray.create(np.asarray(self.cities, dtype=np.float64).reshape(-1, 2))
+        dist = SharedArray.create(self.dm.dense())
+        pipes, procs = [], []
+        try:
+            for seed in self.seeds:
+                parent, child = mp.Pipe()
+                p = mp.Process(target=_island_main, args=(child, points.spec, dist.spec, self.ga_kwargs, seed), daemon=True)
+                p.start()
+                pipes.append(parent)
+                procs.append(p)
+
+            best, best_dist = None, float("inf")
+            no_improve = 0
+            gen = 0
+            immigrants = [None] * self.n_islands
+            while gen < self.generations:
+                if no_improve >= self.patience:
+                    yield gen, list(best), best_dist, False
+                    break
+
+                m = min(self.migration_interval, self.generations - gen)
+                for conn, imm in zip(pipes, immigrants):
+                    conn.send(("run", m, imm, self.migrants))
+                results = [conn.recv() for conn in pipes]
+
+                # Gộp lịch sử: best của thế hệ g = min trên các đảo
+                merged = np.minimum.accumulate(np.min([r[0] for r in results], axis=0))
+                improved = False
+                for g, d in enumerate(merged):
+                    if d < best_dist:
+                        best_dist = float(d)
+                        no_improve = 0
+                        improved = True
+                    else:
+                        no_improve += 1
+                    self.history.record(gen + g, best_dist)
+                for r in results:
+                    if r[1] is not None and r[2] <= best_dist:
+                        best = r[1]
+
+                # Di cư: top cá thể của đảo i sang đảo targets[i]
+                immigrants = [None] * self.n_islands
+                for i, t in enumerate(self._targets()):
+                    immigrants[t] = results[i][3]
+
+                gen += m
+                yield gen - 1, list(best), best_dist, improved
+        finally:
+            self.history.close()
+            for conn in pipes:
+                try:
+                    conn.send(("stop",))
+                except (BrokenPipeError, OSError):
+                    pass
+            for p in procs:
+                p.join(timeout=1.0)
+                if p.is_alive():
+                    p.terminate()
+            points.close()
+            dist.close()
@@ -0,0 +1,174 @@
+import math
+import time
+from collections import deque
+import numpy as np
+from utils.candidates import candidate_lists, insert_candidates, delete_candidates
+
+
+class LocalSearch:
+    # 2-opt + Or-opt trên danh sách láng giềng gần, có don't-look bits.
+    # Mỗi bước chỉ tính delta O(1) từ 4-6 khoảng cách, không tính lại cả tour.
+    def __init__(self, cities, candidates=10, two_opt=True, or_opt=True,
+                 or_max_len=3, max_moves=None, time_limit=None, eps=1e-9):
+        pts = np.asarray(cities, dtype=np.float64).reshape(-1, 2)
+        self.n = len(pts)
+        self.xs = pts[:, 0].tolist()
+        self.ys = pts[:, 1].tolist()
+        if candidates is None or np.isscalar(candidates):
+            candidates = candidate_lists(pts, candidates or 10)
+        self.neigh = np.asarray(candidates).tolist()
+        self.two_opt = two_opt
+        self.or_opt = or_opt
+        self.or_max_len = or_max_len
+        self.max_moves = max_moves  # Ngân sách: số bước cải thiện tối đa mỗi lần gọi
+        self.time_limit = time_limit  # Ngân sách: số giây tối đa mỗi lần gọi
+        self.eps = eps
+        self.moves = 0
+        self.evaluations = 0  # Số delta của move đã tính (mỗi delta O(1), không phải cả tour)
+
+    def _points(self):
+        return np.column_stack([self.xs, self.ys])
+
+    def add_city(self, p):
+        # TSP động: thành phố mới có chỉ số n; chỉ cập nhật danh sách láng giềng bị ảnh hưởng
+        self.xs.append(float(p[0]))
+        self.ys.append(float(p[1]))
+        self.n += 1
+        self.neigh = insert_candidates(np.asarray(self.neigh, dtype=np.int32), self._points()).tolist()
+
+    def remove_city(self, i):
+        del self.xs[i]
+        del self.ys[i]
+        self.n -= 1
+        self.neigh = delete_candidates(np.asarray(self.neigh, dtype=np.int32), self._points(), i).tolist()
+
+    def _d(self, a, b):
+        return math.hypot(self.xs[a] - self.xs[b], self.ys[a] - self.ys[b])
+
+    def _reverse(self, tour, pos, i, j):
+        # Đảo đoạn tour[i..j] (theo chiều xuôi, vòng tròn); đảo phần bù nếu phần bù ngắn hơn
+        n = self.n
+        inner = (j - i) % n + 1
+        if inner * 2 > n:
+            i, j = (j + 1) % n, (i - 1) % n
+            inner = n - inner
+        for _ in range(inner // 2):
+            a, b = tour[i], tour[j]
+            tour[i], tour[j] = b, a
+            pos[a], pos[b] = j, i
+            i = (i + 1) % n
+            j = (j - 1) % n
+
+    def _move(self, tour, pos, a, b, c, d):
+        # 2-opt: bỏ (a,b), (c,d) -> thêm (a,c), (b,d); b đi sau a và d đi sau c theo cùng một chiều
+        n = self.n
+        if tour[(pos[a] + 1) % n] == b:
+            self._reverse(tour, pos, pos[b], pos[c])
+        else:
+            self._reverse(tour, pos, pos[a], pos[d])
+
+    def _try_two_opt(self, tour, pos, a):
+        n = self.n
+        d = self._d
+        for step in (1, -1):
+            b = tour[(pos[a] + step) % n]
+            d_ab = d(a, b)
+            for c in self.neigh[a]:
+                d_ac = d(a, c)
+                if d_ac >= d_ab:
+                    break
+                e = tour[(pos[c] + step) % n]
+                if c == b or e == a:
+                    continue
+                delta = d_ac + d(b, e) - d_ab - d(c, e)
+                self.evaluations += 1
+                if delta < -self.eps:
+                    if step == 1:
+                        self._move(tour, pos, a, b, c, e)
+                    else:
+                        self._move(tour, pos, b, a, e, c)
+                    return (a, b, c, e)
+        return None
+
+    def _try_or_opt(self, tour, pos, s1):
+        n = self.n
+        d = self._d
+        for length in range(1, self.or_max_len + 1):
+            if length + 3 > n:
+                break
+            s2 = tour[(pos[s1] + length - 1) % n]
+            p = tour[(pos[s1] - 1) % n]
+            nx = tour[(pos[s2] + 1) % n]
+            seg = {tour[(pos[s1] + t) % n] for t in range(length)}
+            remove_gain = d(p, s1) + d(s2, nx) - d(p, nx)
+            if remove_gain <= self.eps:
+                continue
+
+            for end in (s1, s2):
+                for c in self.neigh[end]:
+                    if d(end, c) >= remove_gain:
+                        break
+                    if c in seg:
+                        continue
+                    for u, v in ((c, tour[(pos[c] + 1) % n]), (tour[(pos[c] - 1) % n], c)):
+                        if u in seg or v in seg:
+                            continue
+                        # c, e: cạnh chèn theo chiều đi từ nx (s1 -> s2 -> nx -> ... -> c -> e -> ... -> p)
+                        c2, e = (u, v) if tour[(pos[u] + 1) % n] == v else (v, u)
+                        if c2 == nx or e == p:
+                            continue
+                        d_ce = d(c2, e)
+                        rev = d(c2, s2) + d(s1, e) - d_ce
+                        fwd = d(c2, s1) + d(s2, e) - d_ce
+                        self.evaluations += 2
+                        if min(rev, fwd) - remove_gain < -self.eps:
+                            self._move(tour, pos, p, s1, c2, e)
+                            self._move(tour, pos, p, c2, nx, s2)
+                            if fwd < rev:
+                                self._move(tour, pos, c2, s2, s1, e)
+                            return (p, nx, c2, e, s1, s2)
+        return None
+
+    def improve(self, tour, active=None):
+        # active: chỉ bật các thành phố này lúc đầu (vd. quanh chỗ nối tour); mặc định là tất cả
+        tour = [int(x) for x in tour]
+        n = self.n
+        if n < 5:
+            return tour
+        pos = [0] * n
+        for i, c in enumerate(tour):
+            pos[c] = i
+
+        queue = deque(range(n) if active is None else (int(c) for c in active))
+        in_queue = [False] * n
+        for c in queue:
+            in_queue[c] = True
+
+        deadline = None if self.time_limit is None else time.perf_counter() + self.time_limit
+        moves = 0
+        checks = 0
+        while queue:
+            if self.max_moves is not None and moves >= self.max_moves:
+                break
+            checks += 1
+            if deadline is not None and checks % 64 == 0 and time.perf_counter() > deadline:
+                break
+
+            a = queue.popleft()
+            in_queue[a] = False
+            touched = None
+            if self.two_opt:
+                touched = self._try_two_opt(tour, pos, a)
+            if touched is None and self.or_opt:
+                touched = self._try_or_opt(tour, pos, a)
+            if touched is None:
+                continue
+
+            moves += 1
+            for c in touched + (a,):
+                if not in_queue[c]:
+                    in_queue[c] = True
+                    queue.append(c)
+
+        self.moves += moves
+        return tour
@@ -0,0 +1,173 @@
+from collections import namedtuple
+
+# tour chỉ được sao chép với sự kiện "improvement" và "finish"; các sự kiện khác để None
+Event = namedtuple("Event", "kind iteration best_len tour solver reason")
+
+
+class EventHub:
+    def __init__(self):
+        self._improvement = []
+        self._every = []
+        self._stagnation = []
+        self._finish = []
+        self.active = False
+
+    def _changed(self):
+        self.active = bool(self._improvement or self._every or self._stagnation)
+
+    def on_improvement(self, callback):
+        self._improvement.append(callback)
+        self._changed()
+        return callback
+
+    def every(self, n, callback):
+        # Gọi callback sau mỗi n vòng lặp
+        self._every.append((n, callback))
+        self._changed()
+        return callback
+
+    def on_stagnation(self, iterations, callback):
+        # Gọi một lần khi số vòng liên tiếp không cải thiện chạm ngưỡng iterations
+        self._stagnation.append((iterations, callback))
+        self._changed()
+        return callback
+
+    def on_finish(self, callback):
+        self._finish.append(callback)
+        return callback
+
+    def after_step(self, solver, it, improved):
+        if not self.active:
+            return
+        tour, length = solver._best()
+        if improved and self._improvement:
+            ev = Event("improvement", it, length, list(tour), solver, None)
+            for cb in self._improvement:
+                cb(ev)
+        for n, cb in self._every:
+            if (it + 1) % n == 0:
+                cb(Event("progress", it, length, None, solver, None))
+        for k, cb in self._stagnation:
+            if solver.no_improve == k:
+                cb(Event("stagnation", it, length, None, solver, None))
+
+    def finish(self, solver, reason):
+        if not self._finish:
+            return
+        tour, length = solver._best()
+        ev = Event("finish", solver._iteration(), length, list(tour) if tour is not None else None, solver, reason)
+        for cb in self._finish:
+            cb(ev)
+
+
+class Observable:
+    # Vòng chạy chung cho GA / ACO. Lớp con cung cấp _init_run(), step(), _iteration(), _limit(), _best()
+    # cùng các thuộc tính no_improve, patience, checkpoint_every, _resume, history;
+    # dừng / khởi động lại theo độ hội tụ cần thêm _convergence_metric() và _partial_restart()
+    def _setup_events(self):
+        self.events = EventHub()
+        self._started = False
+        self._stop_requested = False
+        self.finish_reason = None
+
+    def _setup_convergence(self, threshold, action, every, restart_fraction):
+        # threshold=None: tắt; dưới ngưỡng -> action "stop" (dừng sớm) hoặc "restart" (khởi động lại một phần)
+        if action not in ("stop", "restart"):
+            raise ValueError(f"converge_action phải là 'stop' hoặc 'restart', không phải {action!r}")
+        self.converge_threshold = threshold
+        self.converge_action = action
+        self.converge_every = max(1, every)
+        self.restart_fraction = restart_fraction
+        self.convergence = None  # giá trị đo gần nhất
+        self.converged = False
+        self.restarts = 0
+
+    def _check_convergence(self):
+        # Gọi cuối mỗi step; chỉ đo mỗi converge_every vòng vì chỉ số tốn O(n^2) / O(pop * n)
+        if self.converge_threshold is None or self._iteration() % self.converge_every:
+            return
+        self.convergence = self._convergence_metric()
+        if self.convergence >= self.converge_threshold:
+            return
+        if self.converge_action == "stop":
+            self.converged = True
+        else:
+            self._partial_restart()
+            self.restarts += 1
+            self.profiler.count("restarts")
+
+    def stop(self):
+        # Yêu cầu dừng sau vòng hiện tại (gọi được từ callback)
+        self._stop_requested = True
+
+    def _done_reason(self):
+        if self._stop_requested:
+            return "stopped"
+        if self.converged:
+            return "converged"
+        if self._iteration() >= self._limit():
+            return "limit"
+        if self.no_improve >= self.patience:
+            return "patience"
+        return None
+
+    @property
+    def done(self):
+        # Chưa start -> False; đã kết thúc -> True cho tới lần start kế tiếp
+        if self._started:
+            return self._done_reason() is not None
+        return self.finish_reason is not None
+
+    def start(self):
+        if self._resume:
+            self._resume = False
+        else:
+            self._init_run()
+        self._stop_requested = False
+        self.converged = False
+        self.finish_reason = None
+        self._started = True
+
+    def _advance(self):
+        it = self._iteration()
+        improved = self.step()
+        if self.checkpoint_every and self._iteration() % self.checkpoint_every == 0:
+            self.save_checkpoint()
+        self.events.after_step(self, it, improved)
+        return improved
+
+    def _finish(self):
+        self.finish_reason = self._done_reason()
+        self._started = False
+        self.history.close()
+        self.events.finish(self, self.finish_reason)
+
+    def run(self, steps=None):
+        # Vòng lặp chặt không yield; steps != None: chạy từng khúc, lần gọi sau chạy tiếp
+        if not self._started:
+            self.start()
+        count = 0
+        while self._done_reason() is None and (steps is None or count < steps):
+            self._advance()
+            count += 1
+        if self._done_reason() is not None:
+            self._finish()
+        return self._best()
+
+    def run_stepwise(self):
+        # Giao diện generator cũ: (vòng, tour tốt nhất, độ dài, improved); tour không bị sao chép mỗi vòng
+        self.start()
+        if self._done_reason() not in (None, "patience"):
+            # Nạp checkpoint của lần chạy đã xong (vd. lưu ở vòng cuối): vẫn trả kết quả đã khôi phục một lần
+            tour, length = self._best()
+            if tour is not None:
+                yield self._iteration() - 1, tour, length, False
+        while self._done_reason() is None:
+            it = self._iteration()
+            improved = self._advance()
+            tour, length = self._best()
+            yield it, tour, length, improved
+        if self._done_reason() == "patience":
+            tour, length = self._best()
+            yield self._iteration(), tour, length, False # False = Đã dừng
+        self._finish()
@@ -0,0 +1,135 @@
+import os
+import multiprocessing as mp
+import numpy as np
+from algorithms.aco import ACO
+from utils.distance import DistanceMatrix
+from utils.shared import SharedArray
+
+
+def _colony_main(conn, specs, alpha, beta, seed):
+    # Worker: gắn vào toạ độ, khoảng cách / danh sách ứng viên và pheromone dùng chung;
+    # mỗi vòng chỉ xây tour cho phần kiến được giao rồi trả về (tours, lengths)
+    shared = {key: SharedArray.attach(spec) for key, spec in specs.items()}
+    try:
+        points = shared["points"].array
+        if "dist" in shared:
+            dm = DistanceMatrix.from_array(points, shared["dist"].array)
+            cand = None
+        else:
+            dm = DistanceMatrix(points, lazy=True)
+            cand = shared["cand"].array
+        # tau0 bất kỳ: pheromone được thay ngay bằng mảng dùng chung
+        aco = ACO(points, n_ants=1, alpha=alpha, beta=beta, seed=seed, dist=dm, candidates=cand, tau0=1.0)
+        # Đọc thẳng pheromone của process chính, không sao chép
+        aco.pheromone = shared["pheromone"].array
+
+        while True:
+            msg = conn.recv()
+            if msg[0] == "stop":
+                break
+            _, count, tau_rest = msg
+            aco.n_ants = count
+            aco.tau_rest = tau_rest
+            tours = aco._build_tours()
+            conn.send((tours, aco._tour_lengths(tours)))
+    finally:
+        aco = dm = points = cand = None
+        for sa in shared.values():
+            sa.close()
+        conn.close()
+
+
+class ParallelACO(ACO):
+    # Chia n_ants kiến của mỗi vòng cho n_workers process; cập nhật pheromone vẫn làm tập trung ở process chính
+    def __init__(self, cities, n_workers=None, **kwargs):
+        if kwargs.get("variant") == "acs":
+            # Cập nhật cục bộ của ACS ghi pheromone ngay trong lúc xây tour -> không chia được cho nhiều process
+            raise ValueError("ParallelACO không hỗ trợ variant='acs'")
+        if kwargs.get("vectorized") is False:
+            raise ValueError("ParallelACO cần vectorized=True")
+        super().__init__(cities, **kwargs)
+        self.n_workers = max(1, min(n_workers or os.cpu_count() or 1, self.n_ants))
+        # Mỗi worker một luồng số ngẫu nhiên độc lập, sinh từ seed chung
+        base = np.random.SeedSequence(kwargs.get("seed"))
+        self.worker_seeds = [int(s.generate_state(1)[0]) for s in base.spawn(self.n_workers)]
+        self._shared = {}
+        self._pipes = []
+        self._procs = []
+
+    def _start_workers(self):
+        if self._procs:
+            return
+        points = np.asarray(self.cities, dtype=np.float64).reshape(-1, 2)
+        self._shared = {"points": SharedArray.create(points)}
+        if self.cand is None:
+            self._shared["dist"] = SharedArray.create(self.dist)
+        else:
+            self._shared["cand"] = SharedArray.create(self.cand)
+        # Pheromone chuyển sang bộ nhớ dùng chung; mọi cập nhật sau đó đều ghi tại chỗ
+        self._shared["pheromone"] = SharedArray.create(self.pheromone)
+        self.pheromone = self._shared["pheromone"].array
+
+        specs = {key: sa.spec for key, sa in self._shared.items()}
+        for seed in self.worker_seeds:
+            parent, child = mp.Pipe()
+            p = mp.Process(target=_colony_main, args=(child, specs, self.alpha, self.beta, seed), daemon=True)
+            p.start()
+            self._pipes.append(parent)
+            self._procs.append(p)
+
+    def _stop_workers(self):
+        for conn in self._pipes:
+            try:
+                conn.send(("stop",))
+            except (BrokenPipeError, OSError):
+                pass
+        for p in self._procs:
+            p.join(timeout=1.0)
+            if p.is_alive():
+                p.terminate()
+        if "pheromone" in self._shared:
+            self.pheromone = self.pheromone.copy()
+        for sa in self._shared.values():
+            sa.close()
+        self._shared, self._pipes, self._procs = {}, [], []
+
+    def _construct(self):
+        counts = [len(c) for c in np.array_split(np.arange(self.n_ants), self.n_workers)]
+        tau_rest = getattr(self, "tau_rest", 1.0)
+        busy = []
+        for conn, count in zip(self._pipes, counts):
+            if count:
+                conn.send(("build", count, tau_rest))
+                busy.append(conn)
+        results = [conn.recv() for conn in busy]
+        return np.vstack([r[0] for r in results]), np.concatenate([r[1] for r in results])
+
+    def _reshape_instance(self, change, arg):
+        # Mảng dùng chung có kích thước cố định -> dừng worker, đổi instance, khởi động lại nếu đang chạy
+        running = bool(self._procs)
+        self._stop_workers()
+        out = change(arg)
+        if running:
+            self._start_workers()
+        return out
+
+    def add_city(self, p):
+        return self._reshape_instance(super().add_city, p)
+
+    def remove_city(self, i):
+        return self._reshape_instance(super().remove_city, i)
+
+    def start(self):
+        self._start_workers()
+        super().start()
+
+    def _finish(self):
+        self._stop_workers()
+        super()._finish()
+
+    def run_stepwise(self):
+        # Generator bị đóng giữa chừng (GUI dừng, hết thời gian) vẫn phải dừng worker
+        try:
+            yield from super().run_stepwise()
+        finally:
+            self._stop_workers()
@@ -0,0 +1,143 @@
+# Đo end-to-end trên instance TSPLIB: thời gian đạt mục tiêu (time-to-target) và sai số theo thời gian
+#   python -m benchmarks.e2e --instance pr107 --solver ga aco --seeds 0 1 2 --time-limit 10 --json e2e.json
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from benchmarks import instances
+from cli import parse_params
+from utils.runner import SOLVERS, make_solver
+
+DEFAULT_TARGETS = [10.0, 5.0, 2.0, 1.0]
+
+
+def run_one(job):
+    inst = instances.load(job["instance"])
+    opt = instances.OPTIMA[job["instance"]]
+    # Dừng theo thời gian nên số vòng coi như vô hạn; riêng decomp đó là số vòng trên mỗi cụm
+    # -> giữ mặc định của Decomposition (hoặc iterations=... trong --decomp)
+    iterations = None if job["solver"] == "decomp" else 10 ** 9
+    solver = make_solver(job["solver"], inst.cities, job["params"], job["seed"], iterations=iterations)
+
+    # Độ dài được tính lại theo metric TSPLIB mỗi khi có cải thiện; thời gian đo lường bị trừ ra
+    overhead = 0.0
+    trace = []
+    start = time.perf_counter()
+    for it, tour, _, improved in solver.run_stepwise():
+        now = time.perf_counter()
+        elapsed = now - start - overhead
+        if improved or not trace:
+            length = inst.tour_length(tour)
+            trace.append((elapsed, it, length, 100.0 * (length - opt) / opt))
+            overhead += time.perf_counter() - now
+            if length <= opt:
+                break
+        if elapsed >= job["time_limit"]:
+            break
+    return dict(job, trace=trace, wall_time=time.perf_counter() - start - overhead)
+
+
+def time_to_target(trace, gap):
+    for elapsed, _, _, g in trace:
+        if g <= gap:
+            return elapsed
+    return float("inf")
+
+
+def gap_at(trace, t):
+    best = float("inf")
+    for elapsed, _, _, g in trace:
+        if elapsed > t:
+            break
+        best = g
+    return best
+
+
+def summarize(runs, targets, points=20):
+    groups = {}
+    for r in runs:
+        groups.setdefault((r["instance"], r["solver"]), []).append(r)
+
+    summary = []
+    for (name, solver), rs in sorted(groups.items()):
+        limit = max(r["time_limit"] for r in rs)
+        grid = np.geomspace(min(1e-3, limit), limit, points)
+        curve = [float(np.median([gap_at(r["trace"], t) for r in rs])) for t in grid]
+        ttt = {}
+        for g in targets:
+            times = [time_to_target(r["trace"], g) for r in rs]
+            ttt[str(g)] = {
+                "median": float(np.median(times)),
+                "success": sum(t < float("inf") for t in times) / len(times),
+            }
+        summary.append({
+            "instance": name,
+            "solver": solver,
+            "runs": len(rs),
+            "final_gap": float(np.median([r["trace"][-1][3] for r in rs])),
+            "time_to_target": ttt,
+            "gap_vs_time": list(zip(grid.tolist(), curve)),
+        })
+    return summary
+
+
+def print_report(summary, targets, baseline=None):
+    old = {(s["instance"], s["solver"]): s for s in baseline or []}
+    head = "".join(f"{'TTT ' + str(g) + '%':>14}" for g in targets)
+    print(f"{'instance':<10}{'solver':<8}{'final gap':>10}{head}")
+    for s in summary:
+        cells = []
+        for g in targets:
+            t = s["time_to_target"][str(g)]["median"]
+            cell = f"{t:.2f}s" if t < float("inf") else "-"
+            prev = old.get((s["instance"], s["solver"]))
+            if prev and t < float("inf"):
+                pt = prev["time_to_target"].get(str(g), {}).get("median", float("inf"))
+                if pt < float("inf"):
+                    cell += f" ({pt / t:.1f}x)"
+            cells.append(f"{cell:>14}")
+        print(f"{s['instance']:<10}{s['solver']:<8}{s['final_gap']:>9.2f}%{''.join(cells)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="End-to-end time-to-target / gap-vs-time benchmark")
+    parser.add_argument("--instance", nargs="+", default=instances.SMALL, choices=sorted(instances.OPTIMA))
+    parser.add_argument("--solver", nargs="+", choices=sorted(SOLVERS), default=["ga", "aco"])
+    parser.add_argument("--seeds", nargs="+", type=int, default=[0, 1, 2])
+    parser.add_argument("--time-limit", type=float, default=10.0)
+    parser.add_argument("--targets", nargs="+", type=float, default=DEFAULT_TARGETS, help="gap targets in %%")
+    parser.add_argument("--ga", nargs="*", metavar="KEY=VALUE")
+    parser.add_argument("--aco", nargs="*", metavar="KEY=VALUE")
+    parser.add_argument("--island", nargs="*", metavar="KEY=VALUE")
+    parser.add_argument("--paco", nargs="*", metavar="KEY=VALUE")
+    parser.add_argument("--decomp", nargs="*", metavar="KEY=VALUE")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--json", help="save runs and summary")
+    parser.add_argument("--compare", help="summary file from another commit")
+    args = parser.parse_args(argv)
+
+    params = {"ga": parse_params(args.ga), "aco": parse_params(args.aco), "island": parse_params(args.island),
+              "paco": parse_params(args.paco), "decomp": parse_params(args.decomp)}
+    jobs = [{"instance": i, "solver": s, "seed": seed, "params": params[s], "time_limit": args.time_limit}
+            for i in args.instance for s in args.solver for seed in args.seeds]
+    if args.workers > 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            runs = list(pool.map(run_one, jobs))
+    else:
+        runs = [run_one(job) for job in jobs]
+
+    summary = summarize(runs, args.targets)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["summary"]
+    print_report(summary, args.targets, baseline)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"runs": runs, "summary": summary}, f, indent=2)
+    return summary
+
+
+if __name__ == "__main__":
+    main()
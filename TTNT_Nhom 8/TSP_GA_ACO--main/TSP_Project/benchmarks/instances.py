@@ -0,0 +1,33 @@
+import os
+from utils.tsplib import read_tsplib, read_tour
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+# Độ dài tối ưu đã biết (TSPLIB, theo metric của từng instance)
+OPTIMA = {
+    "pr107": 44303,
+    "pcb442": 50778,
+    "att532": 27686,
+    "gr666": 294358,
+}
+
+SMALL = ["pr107"]
+MEDIUM = ["pcb442", "att532", "gr666"]
+
+
+def instance_path(name):
+    return os.path.join(DATA_DIR, f"{name}.tsp")
+
+
+def load(name):
+    return read_tsplib(instance_path(name))
+
+
+def optimal_tour(name):
+    path = os.path.join(DATA_DIR, f"{name}.opt.tour")
+    return read_tour(path) if os.path.exists(path) else None
+
+
+def gap(name, length):
+    # Sai số so với tối ưu, tính theo %
+    return 100.0 * (length - OPTIMA[name]) / OPTIMA[name]
@@ -0,0 +1,109 @@
+# Micro-benchmark các hàm nóng của GA / ACO:
+#   python -m benchmarks.micro --n 100 300 --json micro.json [--compare micro_cu.json]
+import json
+import time
+import random
+import argparse
+from algorithms.ga import GA
+from algorithms.aco import ACO
+from utils.tsp_utils import generate_cities, total_distance
+
+
+def timeit(fn, min_time=0.2, repeat=5):
+    # Tự chọn số lần gọi để mỗi lượt đo >= min_time / repeat, lấy lượt nhanh nhất
+    number = 1
+    while True:
+        t = time.perf_counter()
+        for _ in range(number):
+            fn()
+        el = time.perf_counter() - t
+        if el >= min_time / repeat or number >= 1 << 20:
+            break
+        number *= 2
+    best = el / number
+    for _ in range(repeat - 1):
+        t = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - t) / number)
+    return best
+
+
+def kernels(n, seed=0):
+    random.seed(seed)
+    cities = generate_cities(n, width=1000, height=1000, seed=seed)
+    ga = GA(cities, seed=seed)
+    aco = ACO(cities, seed=seed)
+    tour = list(range(n))
+    random.shuffle(tour)
+    pop = ga._random_population()
+    p1, p2 = pop[0].tolist(), pop[1].tolist()
+    visited = set(tour[: n // 2])
+    tours = aco._build_tours()
+    lengths = aco._tour_lengths(tours)
+
+    def update_pheromone():
+        saved = aco.pheromone.copy()
+        aco._update_pheromone(tours, lengths)
+        aco.pheromone = saved
+
+    return {
+        "total_distance": lambda: total_distance(tour, cities),
+        "total_distance[matrix]": lambda: total_distance(tour, cities, ga.dm),
+        "tour_lengths[pop]": lambda: ga.dm.tour_lengths(pop),
+        "_select_next": lambda: aco._select_next(tour[n // 2 - 1], visited),
+        "_build_tours": aco._build_tours,
+        "_crossover": lambda: ga._crossover(p1, p2),
+        "_crossover_batch": lambda: ga._crossover_batch(pop, pop[::-1]),
+        "_update_pheromone": update_pheromone,
+    }
+
+
+def run(sizes, only=None, min_time=0.2):
+    results = []
+    for n in sizes:
+        for name, fn in kernels(n).items():
+            if only and name not in only:
+                continue
+            results.append({"kernel": name, "n": n, "seconds": timeit(fn, min_time)})
+    return results
+
+
+def compare(results, baseline):
+    old = {(r["kernel"], r["n"]): r["seconds"] for r in baseline}
+    for r in results:
+        prev = old.get((r["kernel"], r["n"]))
+        r["speedup"] = prev / r["seconds"] if prev else None
+    return results
+
+
+def print_table(results):
+    print(f"{'kernel':<26}{'n':>6}{'time/call':>14}{'vs baseline':>14}")
+    for r in results:
+        sp = r.get("speedup")
+        sp = f"{sp:.2f}x" if sp else "-"
+        print(f"{r['kernel']:<26}{r['n']:>6}{r['seconds'] * 1e6:>12.1f}us{sp:>14}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for GA / ACO hot kernels")
+    parser.add_argument("--n", nargs="+", type=int, default=[100, 300])
+    parser.add_argument("--kernel", nargs="+", help="only run these kernels")
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--json", help="save results")
+    parser.add_argument("--compare", help="results file from another commit")
+    args = parser.parse_args(argv)
+
+    results = run(args.n, args.kernel, args.min_time)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+    print_table(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# Chạy GA / ACO không cần giao diện (không import PyQt5):
+#   python cli.py --solver ga aco --n 50 100 --seeds 0 1 2 --iterations 500 --workers 4 --json out.json
+# Instance rất lớn: chia cụm, giải từng cụm song song rồi nối lại
+#   python cli.py --solver decomp --n 50000 --iterations 50 --decomp solver=aco cluster_size=200 workers=4
+import sys
+import ast
+import csv
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from utils.runner import SOLVERS, run_job
+from utils.profiling import format_stats
+
+CSV_FIELDS = ["solver", "instance", "n", "seed", "best_length", "iterations", "wall_time", "time_to_best", "params"]
+
+
+def parse_params(items):
+    params = {}
+    for item in items or []:
+        key, _, value = item.partition("=")
+        try:
+            params[key] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            params[key] = value
+    return params
+
+
+def build_jobs(args):
+    instances = list(args.n or []) + list(args.instance or [])
+    params = {"ga": parse_params(args.ga), "aco": parse_params(args.aco), "island": parse_params(args.island),
+              "paco": parse_params(args.paco), "decomp": parse_params(args.decomp)}
+    jobs = []
+    for inst in instances:
+        for solver in args.solver:
+            for seed in args.seeds:
+                jobs.append({
+                    "solver": solver,
+                    "instance": inst,
+                    "instance_seed": args.instance_seed,
+                    "seed": seed,
+                    "params": params[solver],
+                    "iterations": args.iterations,
+                    "time_limit": args.time_limit,
+                    "target": args.target,
+                    "checkpoint_dir": args.checkpoint_dir,
+                    "checkpoint_every": args.checkpoint_every,
+                    "resume": args.resume,
+                    "profile": args.profile,
+                })
+    return jobs
+
+
+def run_jobs(jobs, workers=1):
+    if workers <= 1:
+        return [run_job(job) for job in jobs]
+    # Mỗi seed / instance độc lập -> chia cho các process
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run_job, jobs))
+
+
+def write_csv(results, f):
+    writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+    writer.writeheader()
+    for r in results:
+        writer.writerow(dict(r, params=json.dumps(r["params"])))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless TSP runner for GA / ACO")
+    parser.add_argument("--solver", nargs="+", choices=sorted(SOLVERS), default=["ga", "aco"])
+    parser.add_argument("--n", nargs="+", type=int, help="generated instance sizes")
+    parser.add_argument("--instance", nargs="+", help="instance files")
+    parser.add_argument("--instance-seed", type=int, default=0, help="seed for generated instances")
+    parser.add_argument("--seeds", nargs="+", type=int, default=[0])
+    parser.add_argument("--iterations", type=int, help="generations (GA) / n_iter (ACO), per cluster for decomp")
+    parser.add_argument("--time-limit", type=float, help="wall-clock budget per run, seconds")
+    parser.add_argument("--target", type=float, help="stop once best length <= target")
+    parser.add_argument("--ga", nargs="*", metavar="KEY=VALUE", help="GA parameters, e.g. pop_size=100")
+    parser.add_argument("--aco", nargs="*", metavar="KEY=VALUE", help="ACO parameters, e.g. alpha=1 beta=3")
+    parser.add_argument("--island", nargs="*", metavar="KEY=VALUE", help="island GA parameters, e.g. n_islands=8")
+    parser.add_argument("--paco", nargs="*", metavar="KEY=VALUE", help="parallel ACO parameters, e.g. n_workers=4")
+    parser.add_argument("--decomp", nargs="*", metavar="KEY=VALUE",
+                        help="decomposition parameters, e.g. solver=ga cluster_size=300 partition=kmeans workers=4")
+    parser.add_argument("--checkpoint-dir", help="save solver state (.npz) and the distance matrix cache here")
+    parser.add_argument("--checkpoint-every", type=int, default=100, help="iterations between checkpoints")
+    parser.add_argument("--resume", action="store_true", help="continue runs from checkpoints in --checkpoint-dir")
+    parser.add_argument("--profile", action="store_true",
+                        help="time each solver phase and count tours / evaluations (ga, aco, paco)")
+    parser.add_argument("--workers", type=int, default=1, help="process pool size")
+    parser.add_argument("--json", help="write full results (with tours and traces) to this file")
+    parser.add_argument("--csv", help="write a summary table to this file ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    if not args.n and not args.instance:
+        parser.error("give --n and/or --instance")
+
+    results = run_jobs(build_jobs(args), args.workers)
+    for r in results:
+        if "stats" in r:
+            print(f"== {r['solver']} {r['instance']} seed={r['seed']}", file=sys.stderr)
+            print(format_stats(r["stats"]), file=sys.stderr)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.csv == "-":
+        write_csv(results, sys.stdout)
+    elif args.csv:
+        with open(args.csv, "w", newline="") as f:
+            write_csv(results, f)
+    if not args.json and not args.csv:
+        summary = [{k: r[k] for k in CSV_FIELDS + ["stats"] if k in r} for r in results]
+        json.dump(summary, sys.stdout, indent=2)
+        print()
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import time
+
+
+class RoutePlot:
+    # Vẽ tour theo kiểu tăng dần: trục, thành phố, lưới chỉ tạo một lần (set_cities);
+    # mỗi lần update chỉ set_data cho đường đi + đổi chữ, rồi blit lại phần nền đã lưu
+    def __init__(self, fig, canvas, color, theme, max_fps=30):
+        self.fig = fig
+        self.canvas = canvas
+        self.color = color
+        self.theme = theme
+        self.min_interval = 1.0 / max_fps
+        self.ax = None
+        self.background = None
+        self.cities = []
+        self.last_draw = 0.0
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def set_cities(self, cities):
+        self.cities = cities
+        self.fig.clear()
+        self.fig.subplots_adjust(left=0.08, right=0.98, top=0.96, bottom=0.08)
+        ax = self.fig.add_subplot(111)
+        ax.set_facecolor(self.theme['bg_card'])
+
+        xs = [c[0] for c in cities]
+        ys = [c[1] for c in cities]
+        ax.scatter(xs, ys, c='white', s=25, alpha=0.7, zorder=2)
+        # Các artist động không tự co giãn trục -> đặt giới hạn trục cố định theo thành phố
+        pad_x = max((max(xs) - min(xs)) * 0.05, 1)
+        pad_y = max((max(ys) - min(ys)) * 0.05, 1)
+        ax.set_xlim(min(xs) - pad_x, max(xs) + pad_x)
+        ax.set_ylim(min(ys) - pad_y, max(ys) + pad_y)
+        ax.grid(True, color='#444444', linestyle='--', linewidth=0.5, alpha=0.4)
+        ax.tick_params(axis='both', colors='#888888', labelsize=9)
+        for spine in ax.spines.values(): spine.set_edgecolor('#333333')
+
+        self.line, = ax.plot([], [], color=self.color, linewidth=2, alpha=0.9, zorder=1, animated=True)
+        self.glow, = ax.plot([], [], color=self.color, linewidth=6, alpha=0.2, zorder=1, animated=True)
+        self.start, = ax.plot([], [], color=self.theme['btn_run'], marker='*', markersize=12,
+                              linestyle='none', zorder=3, animated=True)
+        self.dist_text = ax.text(0.98, 0.02, "", transform=ax.transAxes,
+                                 color=self.color, fontsize=12, fontweight='bold', ha='right', va='bottom',
+                                 bbox=dict(facecolor=self.theme['bg_main'], alpha=0.7, edgecolor=self.color, boxstyle='round,pad=0.3'),
+                                 animated=True)
+        self.label_text = ax.text(0.02, 0.98, "", transform=ax.transAxes,
+                                  color="white", fontsize=10, fontweight='bold', ha='left', va='top',
+                                  bbox=dict(facecolor="#333", alpha=0.6, edgecolor="none", boxstyle='round,pad=0.2'),
+                                  animated=True)
+        self.ax = ax
+        self.background = None
+        self.canvas.draw()
+
+    def _artists(self):
+        return (self.glow, self.line, self.start, self.dist_text, self.label_text)
+
+    def _on_draw(self, event):
+        # Mỗi lần vẽ lại toàn bộ (lần đầu, đổi kích thước cửa sổ) -> lưu lại nền tĩnh
+        if self.ax is None:
+            return
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        for artist in self._artists():
+            self.ax.draw_artist(artist)
+
+    def update(self, path, dist, label_text, improved=False, force=False):
+        if self.ax is None:
+            return False
+        now = time.perf_counter()
+        if not (improved or force) and now - self.last_draw < self.min_interval:
+            return False
+
+        if path is not None and (improved or force):
+            xs = [self.cities[i][0] for i in path] + [self.cities[path[0]][0]]
+            ys = [self.cities[i][1] for i in path] + [self.cities[path[0]][1]]
+            self.line.set_data(xs, ys)
+            self.glow.set_data(xs, ys)
+            self.start.set_data([xs[0]], [ys[0]])
+        self.dist_text.set_text(f"DIST: {dist:.1f}")
+        self.label_text.set_text(label_text)
+
+        if self.background is None:
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self.background)
+            for artist in self._artists():
+                self.ax.draw_artist(artist)
+            self.canvas.blit(self.fig.bbox)
+        self.last_draw = now
+        return True
@@ -0,0 +1,119 @@
+import time
+import queue
+import multiprocessing as mp
+from collections import namedtuple
+
+# Ảnh chụp tiến trình gửi từ process giải về GUI; tour chỉ có khi vừa cải thiện
+Snapshot = namedtuple("Snapshot", "iteration best_len tour cpu wall done history stats")
+
+MAX_SPEED = 100  # Giá trị thanh tốc độ ứng với "chạy hết tốc độ"
+TICK = 0.016  # Nhịp 16 ms của timer cũ: tốc độ v = v bước mỗi nhịp
+REPORT_EVERY = 0.03  # Snapshot không cải thiện: tối đa một lần mỗi 30 ms
+
+
+def _run(solver_cls, cities, kwargs, out_q, stop_evt, running, speed, start_wall):
+    solver = solver_cls(cities, **kwargs)
+    cpu0 = time.process_time()
+    t0 = time.perf_counter()
+    steps = 0
+    last_report = 0.0
+    last = None
+
+    for it, tour, dist, improved in solver.run_stepwise():
+        if stop_evt.is_set():
+            break
+        if not running.is_set():
+            # Tạm dừng: không tính thời gian chờ vào nhịp tốc độ
+            paused = time.perf_counter()
+            running.wait()
+            t0 += time.perf_counter() - paused
+            if stop_evt.is_set():
+                break
+
+        now = time.perf_counter()
+        if improved or last is None:
+            out_q.put(Snapshot(it, dist, list(tour), time.process_time() - cpu0, time.time() - start_wall, False, None, None))
+            last_report = now
+        elif now - last_report >= REPORT_EVERY:
+            out_q.put(Snapshot(it, dist, None, time.process_time() - cpu0, time.time() - start_wall, False, None, None))
+            last_report = now
+        last = (it, dist)
+
+        # Giới hạn tốc độ theo thanh trượt (giữ cảm giác "10x" của bản cũ); MAX_SPEED = không giới hạn
+        steps += 1
+        v = speed.value
+        if v < MAX_SPEED:
+            ahead = steps * TICK / max(v, 1) - (time.perf_counter() - t0)
+            if ahead > 0:
+                time.sleep(ahead)
+
+    it, dist = last if last is not None else (0, float("inf"))
+    # Bị dừng giữa chừng thì run_stepwise chưa kịp đóng lịch sử; History gửi đi dạng mảng gọn
+    solver.history.close()
+    stats = solver.stats() if hasattr(solver, "stats") else None
+    out_q.put(Snapshot(it, dist, None, time.process_time() - cpu0, time.time() - start_wall, True, solver.history, stats))
+
+
+class SolverWorker:
+    # Chạy GA / ACO trong process riêng; GUI chỉ đọc snapshot từ hàng đợi theo nhịp khung hình
+    def __init__(self, solver_cls, cities, start_wall=None, speed=MAX_SPEED, **kwargs):
+        self.queue = mp.Queue()
+        self.stop_evt = mp.Event()
+        self.running = mp.Event()
+        self.running.set()
+        self.speed = mp.Value("i", speed)
+        self.done = False
+        self.history = []
+        self.stats = None  # solver.stats() lúc kết thúc (truyền profile=True để có thời gian từng pha)
+        self.process = mp.Process(
+            target=_run,
+            args=(solver_cls, cities, kwargs, self.queue, self.stop_evt, self.running, self.speed,
+                  time.time() if start_wall is None else start_wall),
+            daemon=True,
+        )
+
+    def start(self):
+        self.process.start()
+
+    def pause(self):
+        self.running.clear()
+
+    def resume(self):
+        self.running.set()
+
+    def set_speed(self, value):
+        self.speed.value = int(value)
+
+    def stop(self):
+        self.stop_evt.set()
+        self.running.set()
+
+    def poll(self, max_items=1000):
+        snaps = []
+        while len(snaps) < max_items:
+            try:
+                snap = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            snaps.append(snap)
+            if snap.done:
+                self.done = True
+                self.history = snap.history
+                self.stats = snap.stats
+        return snaps
+
+    def join(self, timeout=1.0):
+        # Lấy nốt snapshot cuối (kèm history) rồi đóng process
+        deadline = time.time() + timeout
+        while not self.done and time.time() < deadline:
+            try:
+                snap = self.queue.get(timeout=0.05)
+            except queue.Empty:
+                continue
+            if snap.done:
+                self.done = True
+                self.history = snap.history
+                self.stats = snap.stats
+        self.process.join(timeout=0.1)
+        if self.process.is_alive():
+            self.process.terminate()
@@ -11,6 +11,8 @@ from matplotlib.figure import Figure
 from utils.tsp_utils import generate_cities
 from algorithms.ga import GA
 from algorithms.aco import ACO
+from gui.solver_worker import SolverWorker
+from gui.route_plot import RoutePlot
 
 # --- THEME ---
 THEME = {
@@ -55,6 +57,7 @@ class TSPApp(QWidget):
         self.setFont(QFont("Segoe UI", 10))
         self.setStyleSheet(f"background-color: {THEME['bg_main']}; color: {THEME['text_main']};")
         self.cities = []
+        self.ga_worker = None; self.aco_worker = None
         self._build_ui()
         self.timer = QTimer()
         self.timer.timeout.connect(self.stepupdate)
@@ -153,6 +156,8 @@ class TSPApp(QWidget):
         graphs_layout = QHBoxLayout(graphs_area)
         self.panel_ga, self.fig_ga, self.can_ga = self._create_graph_panel("GENETIC ALGORITHM", THEME['accent_ga'])
         self.panel_aco, self.fig_aco, self.can_aco = self._create_graph_panel("ANT COLONY", THEME['accent_aco'])
+        self.plot_ga = RoutePlot(self.fig_ga, self.can_ga, THEME['accent_ga'], THEME)
+        self.plot_aco = RoutePlot(self.fig_aco, self.can_aco, THEME['accent_aco'], THEME)
         graphs_layout.addWidget(self.panel_ga)
         graphs_layout.addWidget(self.panel_aco)
 
@@ -184,6 +189,8 @@ class TSPApp(QWidget):
     def update_speed_label(self, value):
         text = "(Chậm)" if value < 10 else "(Bình thường)" if value < 30 else "(Nhanh)" if value < 80 else "(Tối đa)"
         self.lbl_speed_display.setText(f"Tốc độ: {value}x {text}")
+        for worker in (self.ga_worker, self.aco_worker):
+            if worker is not None: worker.set_speed(value)
 
     # Logic chạy
     def run(self):
@@ -193,22 +200,27 @@ class TSPApp(QWidget):
         except: return
 
         COMMON_POP = 50
-        
+        # Trục, thành phố, lưới chỉ vẽ một lần cho mỗi lượt chạy
+        self.plot_ga.set_cities(self.cities)
+        self.plot_aco.set_cities(self.cities)
+        self.start_time_wall = time.time()
+        speed = self.speed_slider.value()
+
+        # Mỗi thuật toán chạy trong process riêng (song song trên 2 nhân), GUI chỉ đọc snapshot
         # 1. ACO: Chạy chuẩn 500 vòng
-        self.aco = ACO(self.cities, n_ants=COMMON_POP, n_iter=500, patience=500)
+        self.aco_worker = SolverWorker(ACO, self.cities, self.start_time_wall, speed,
+                                       n_ants=COMMON_POP, n_iter=500, patience=500)
 
         # 2. GA: Chạy vô tận đến khi tìm ra đường ngắn nhất
         # Mục đích: Bắt buộc nó phải chạy cho đến khi đuổi kịp ACO
-        self.ga = GA(self.cities, pop_size=COMMON_POP, generations=1000000, patience=999999)
-
-        self.ga_gen = self.ga.run_stepwise()
-        self.aco_gen = self.aco.run_stepwise()
+        # Lịch sử lấy mẫu thưa dần (log) để không phình tới 1 triệu dòng
+        self.ga_worker = SolverWorker(GA, self.cities, self.start_time_wall, speed,
+                                      pop_size=COMMON_POP, generations=1000000, patience=999999, history="log")
 
         self.ga_done = False; self.aco_done = False
         self.ga_step = 0; self.aco_step = 0
         
         self.ga_cpu_total = 0.0; self.aco_cpu_total = 0.0
-        self.start_time_wall = time.time()
         self.ga_time_best = 0.0; self.aco_time_best = 0.0
         
         # Reset khoảng cách về Vô cùng
@@ -218,76 +230,76 @@ class TSPApp(QWidget):
         self.lbl_status.setText("SIMULATION RUNNING...")
         self.lbl_status.setStyleSheet(f"color: {THEME['accent_ga']}; border: none; font-weight: bold;")
         self.run_btn.setEnabled(False); self.pause_btn.setEnabled(True); self.stop_btn.setEnabled(True); self.city_spin.setEnabled(False)
+        self.aco_worker.start(); self.ga_worker.start()
         self.timer.start(16)
 
     def force_stop(self):
         self.timer.stop()
         self.ga_done = True; self.aco_done = True
+        self.stop_workers()
         self.finish_run()
         QMessageBox.information(self, "Stop", "Đã dừng chương trình!")
 
     def toggle_pause(self):
         if self.timer.isActive():
             self.timer.stop(); self.pause_btn.setText("TIẾP TỤC"); self.lbl_status.setText("PAUSED")
+            self.ga_worker.pause(); self.aco_worker.pause()
         else:
+            self.ga_worker.resume(); self.aco_worker.resume()
             self.timer.start(16); self.pause_btn.setText("TẠM DỪNG"); self.lbl_status.setText("RUNNING...")
 
-    def stepupdate(self):
-        steps_limit = self.speed_slider.value()
-        current_wall_time = time.time() - self.start_time_wall
+    def stop_workers(self):
+        for worker in (self.ga_worker, self.aco_worker):
+            if worker is not None:
+                worker.stop(); worker.join()
 
+    def stepupdate(self):
+        # Đọc snapshot từ 2 process giải; GUI không còn gọi next() trong vòng lặp sự kiện
         # Xử lý ACO
         if not self.aco_done:
-            t_cpu_start = time.perf_counter()
-            steps_run = 0
-            while steps_run < steps_limit:
-                try:
-                    it, path, dist, improved = next(self.aco_gen)
-                    self.aco_step = it
-                    self.current_path_aco = path
-                    self.current_dist_aco = dist
-                    steps_run += 1
-                    if improved: 
-                        self.aco_time_best = current_wall_time
-                except StopIteration:
-                    self.aco_done = True
-                    break
-            self.aco_cpu_total += (time.perf_counter() - t_cpu_start)
-            if hasattr(self, 'current_path_aco'):
-                self.draw_graph(self.fig_aco, self.can_aco, self.current_path_aco, self.current_dist_aco, THEME['accent_aco'], f"ITER: {self.aco_step}")
+            snaps = self.aco_worker.poll()
+            improved = False
+            for snap in snaps:
+                self.aco_step = snap.iteration
+                self.current_dist_aco = snap.best_len
+                self.aco_cpu_total = snap.cpu
+                if snap.tour is not None:
+                    self.current_path_aco = snap.tour
+                    self.aco_time_best = snap.wall
+                    improved = True
+            if self.aco_worker.done:
+                self.aco_done = True
+            if snaps and hasattr(self, 'current_path_aco'):
+                self.plot_aco.update(self.current_path_aco, self.current_dist_aco, f"ITER: {self.aco_step}", improved, force=self.aco_done)
 
         # Xử lý GA
         if not self.ga_done:
-            t_cpu_start = time.perf_counter()
-            steps_run = 0
-            while steps_run < steps_limit:
-                try:
-                    gen, path, dist, improved = next(self.ga_gen)
-                    self.ga_step = gen
-                    self.current_path_ga = path
-                    self.current_dist_ga = dist
-                    steps_run += 1
-                    if improved: 
-                        self.ga_time_best = current_wall_time
-
-                    # Chỉ dừng khi ACO đã xong
-                    if self.aco_done:
-                        # CHO PHÉP SAI SỐ: Nếu GA chỉ kém ACO dưới 0.5 đơn vị khoảng cách -> COI NHƯ BẰNG NHAU -> DỪNG
-                        # Điều này giúp tránh việc GA bị kẹt vì 0.00001 chênh lệch
-                        TOLERANCE = 0.5 
-                        
-                        if self.current_dist_ga <= (self.current_dist_aco + TOLERANCE):
-                            self.ga_done = True
-                            self.lbl_status.setText("GA ĐÃ ĐUỔI KỊP (SẤP XỈ)!")
-                            break
-                        
-                except StopIteration:
+            snaps = self.ga_worker.poll()
+            improved = False
+            for snap in snaps:
+                self.ga_step = snap.iteration
+                self.current_dist_ga = snap.best_len
+                self.ga_cpu_total = snap.cpu
+                if snap.tour is not None:
+                    self.current_path_ga = snap.tour
+                    self.ga_time_best = snap.wall
+                    improved = True
+            if self.ga_worker.done:
+                self.ga_done = True
+
+            # Chỉ dừng khi ACO đã xong
+            if self.aco_done and not self.ga_done:
+                # CHO PHÉP SAI SỐ: Nếu GA chỉ kém ACO dưới 0.5 đơn vị khoảng cách -> COI NHƯ BẰNG NHAU -> DỪNG
+                # Điều này giúp tránh việc GA bị kẹt vì 0.00001 chênh lệch
+                TOLERANCE = 0.5
+
+                if self.current_dist_ga <= (self.current_dist_aco + TOLERANCE):
+                    self.ga_worker.stop()
                     self.ga_done = True
-                    break
-            
-            self.ga_cpu_total += (time.perf_counter() - t_cpu_start)
-            if hasattr(self, 'current_path_ga'):
-                self.draw_graph(self.fig_ga, self.can_ga, self.current_path_ga, self.current_dist_ga, THEME['accent_ga'], f"GEN: {self.ga_step}")
+                    self.lbl_status.setText("GA ĐÃ ĐUỔI KỊP (SẤP XỈ)!")
+
+            if snaps and hasattr(self, 'current_path_ga'):
+                self.plot_ga.update(self.current_path_ga, self.current_dist_ga, f"GEN: {self.ga_step}", improved, force=self.ga_done)
 
         # --- UPDATE LABELS ---
         self.lbl_cpu_ga.setText(f"GA CPU: {self.ga_cpu_total:.3f}s")
@@ -306,6 +318,7 @@ class TSPApp(QWidget):
         # Chỉ dừng khi cả 2 cùng xong
         if self.ga_done and self.aco_done:
             self.timer.stop()
+            self.stop_workers()
             self.finish_run()
 
     def finish_run(self):
@@ -333,45 +346,16 @@ class TSPApp(QWidget):
             f"-> {msg}"
         )
 
-    def draw_graph(self, fig, canvas, path, dist, color, label_text):
-        fig.clear()
-        fig.subplots_adjust(left=0.08, right=0.98, top=0.96, bottom=0.08)
-        ax = fig.add_subplot(111)
-        ax.set_facecolor(THEME['bg_card'])
-
-        xs = [self.cities[i][0] for i in path] + [self.cities[path[0]][0]]
-        ys = [self.cities[i][1] for i in path] + [self.cities[path[0]][1]]
-
-        ax.plot(xs, ys, color=color, linewidth=2, alpha=0.9, zorder=1)
-        ax.plot(xs, ys, color=color, linewidth=6, alpha=0.2, zorder=1) 
-        ax.scatter([c[0] for c in self.cities], [c[1] for c in self.cities], c='white', s=25, alpha=0.7, zorder=2)
-        
-        start = self.cities[path[0]]
-        ax.scatter([start[0]], [start[1]], c=THEME['btn_run'], s=100, marker='*', zorder=3)
-        ax.grid(True, color='#444444', linestyle='--', linewidth=0.5, alpha=0.4)
-        ax.tick_params(axis='both', colors='#888888', labelsize=9)
-        for spine in ax.spines.values(): spine.set_edgecolor('#333333')
-
-        ax.text(0.98, 0.02, f"DIST: {dist:.1f}", transform=ax.transAxes, 
-                color=color, fontsize=12, fontweight='bold', ha='right', va='bottom',
-                bbox=dict(facecolor=THEME['bg_main'], alpha=0.7, edgecolor=color, boxstyle='round,pad=0.3'))
-        
-        ax.text(0.02, 0.98, label_text, transform=ax.transAxes, 
-                color="white", fontsize=10, fontweight='bold', ha='left', va='top',
-                bbox=dict(facecolor="#333", alpha=0.6, edgecolor="none", boxstyle='round,pad=0.2'))
-
-        canvas.draw()
-
     def save_csv(self):
         try:
             with open("ga_history.csv", "w", newline="") as f:
                 writer = csv.writer(f)
                 writer.writerow(["Generation", "BestDistance"])
-                writer.writerows(self.ga.history)
+                writer.writerows(self.ga_worker.history)
             with open("aco_history.csv", "w", newline="") as f:
                 writer = csv.writer(f)
                 writer.writerow(["Iteration", "BestDistance"])
-                writer.writerows(self.aco.history)
+                writer.writerows(self.aco_worker.history)
             QMessageBox.information(self, "Export", "Xuất file thành công!")
         except: pass
 
@@ -0,0 +1,20 @@
+# Chạy từ thư mục TSP_Project: python -m pytest tests
+import math
+from cli import main
+
+
+def _run(tmp_path, *extra):
+    out = tmp_path / f"out{len(extra)}.json"
+    return main(["--solver", "ga", "aco", "--n", "50", "--iterations", "40", "--checkpoint-dir", str(tmp_path),
+                 "--checkpoint-every", "10", "--json", str(out), *extra])
+
+
+def test_resume_finished_run(tmp_path):
+    # Checkpoint lưu ở vòng cuối: chạy lại với --resume phải trả đúng kết quả đã khôi phục
+    first = _run(tmp_path)
+    resumed = _run(tmp_path, "--resume")
+    for a, b in zip(first, resumed):
+        assert math.isfinite(b["best_length"])
+        assert b["best_length"] == a["best_length"]
+        assert b["tour"] == a["tour"]
+        assert b["iterations"] == a["iterations"] == 40
@@ -0,0 +1,207 @@
+# Dò tham số GA / ACO kiểu F-race / irace: nhiều cấu hình chạy song song trên các khối (instance, seed),
+# sau mỗi khối kiểm định Friedman loại sớm cấu hình kém; vài vòng lặp, vòng sau lấy mẫu quanh cấu hình tốt.
+#   python -m tuning.race --solver aco --instances 100 200 pr107 --seeds 0 1 --time-limit 5 --workers 4
+# Chi phí một lần chạy: thời gian đạt chất lượng mục tiêu (tour <= (1 + gap%) * tham chiếu);
+# tham chiếu của mỗi instance là tour greedy-edge + 2-opt / Or-opt
+import sys
+import json
+import time
+import math
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from benchmarks import instances
+from cli import parse_params
+from utils.runner import make_cities, make_solver
+from utils.distance import DistanceMatrix
+from algorithms.construction import greedy_edge
+from algorithms.local_search import LocalSearch
+from tuning.stats import race_survivors, rankdata
+
+# Không gian tham số: ("int" | "float" | "log", thấp, cao) hoặc list các lựa chọn
+SPACES = {
+    "ga": {
+        "pop_size": ("int", 20, 200),
+        "mutation_rate": ("log", 0.005, 0.3),
+        "mutation": ["swap", "inversion"],
+        "selection": ["random", "tournament", "rank"],
+        "replacement": ["generational", "steady_state"],
+        "crossover": ["ox", "erx", "eax"],
+    },
+    "aco": {
+        "n_ants": ("int", 10, 100),
+        "alpha": ("float", 0.5, 3.0),
+        "beta": ("float", 1.0, 6.0),
+        "rho": ("log", 0.01, 0.5),
+        "q": ("log", 0.1, 10.0),
+        "variant": ["as", "mmas", "acs"],
+    },
+}
+# ParallelACO không chạy được ACS
+SPACES["paco"] = dict(SPACES["aco"], variant=["as", "mmas"])
+
+
+def _sample(spec, rng):
+    if isinstance(spec, list):
+        return spec[int(rng.integers(len(spec)))]
+    kind, lo, hi = spec
+    if kind == "int":
+        return int(rng.integers(lo, hi + 1))
+    if kind == "log":
+        return float(math.exp(rng.uniform(math.log(lo), math.log(hi))))
+    return float(rng.uniform(lo, hi))
+
+
+def _perturb(value, spec, rng, scale):
+    # Lấy mẫu quanh giá trị của cấu hình tốt; scale thu hẹp dần qua các vòng
+    if isinstance(spec, list):
+        return value if rng.random() > scale else spec[int(rng.integers(len(spec)))]
+    kind, lo, hi = spec
+    if kind == "log":
+        x = math.exp(rng.normal(math.log(value), scale * (math.log(hi) - math.log(lo))))
+    else:
+        x = rng.normal(value, scale * (hi - lo))
+    x = min(max(x, lo), hi)
+    return int(round(x)) if kind == "int" else float(x)
+
+
+def sample_configs(space, count, rng, elites=(), scale=0.5):
+    configs = []
+    for i in range(count):
+        if elites:
+            parent = elites[i % len(elites)]
+            configs.append({k: _perturb(parent[k], spec, rng, scale) for k, spec in space.items()})
+        else:
+            configs.append({k: _sample(spec, rng) for k, spec in space.items()})
+    return configs
+
+
+def reference_length(instance):
+    # Mốc chất lượng rẻ mà khá tốt (thường cách tối ưu vài %): greedy-edge rồi 2-opt + Or-opt
+    cities = load_instance(instance)
+    tour = LocalSearch(cities).improve(greedy_edge(cities))
+    return DistanceMatrix(cities, lazy=True).tour_length(tour)
+
+
+def load_instance(instance):
+    if instance in instances.OPTIMA:
+        return instances.load(instance).cities
+    return make_cities(instance)
+
+
+def evaluate(job):
+    # Một lần chạy: dừng khi đạt mục tiêu hoặc hết giờ; chi phí = thời gian đạt mục tiêu,
+    # chưa đạt thì phạt time_limit * (1 + best / target) -> luôn xếp sau mọi lần đạt, càng gần càng tốt
+    cities = load_instance(job["instance"])
+    solver = make_solver(job["solver"], cities, job["params"], job["seed"], iterations=10 ** 9)
+    best = float("inf")
+    reached = None
+    start = time.perf_counter()
+    for _, _, length, _ in solver.run_stepwise():
+        best = length
+        elapsed = time.perf_counter() - start
+        if best <= job["target"]:
+            reached = elapsed
+            break
+        if elapsed >= job["time_limit"]:
+            break
+    cost = reached if reached is not None else job["time_limit"] * (1 + best / job["target"])
+    return {"cost": cost, "reached": reached, "best": best}
+
+
+def race(solver, configs, blocks, targets, base, time_limit, pool, alpha=0.05, first_test=5, log=None):
+    # F-race: thêm lần lượt từng khối, chạy mọi cấu hình còn sống; từ khối first_test trở đi kiểm định và loại
+    alive = list(range(len(configs)))
+    costs = {i: [] for i in alive}
+    runs = {i: [] for i in alive}
+    for b, (instance, seed) in enumerate(blocks):
+        jobs = [{"solver": solver, "instance": instance, "seed": seed, "params": dict(base, **configs[i]),
+                 "target": targets[instance], "time_limit": time_limit} for i in alive]
+        for i, res in zip(alive, pool.map(evaluate, jobs)):
+            costs[i].append(res["cost"])
+            runs[i].append(res)
+        if b + 1 >= first_test and len(alive) > 1:
+            keep = race_survivors(np.array([costs[i] for i in alive]).T, alpha)
+            dropped = [alive[j] for j in range(len(alive)) if j not in keep]
+            alive = [alive[j] for j in keep]
+            if log and dropped:
+                log(f"  block {b + 1}: dropped {len(dropped)}, {len(alive)} left")
+        if len(alive) == 1:
+            break
+    # Xếp các cấu hình còn lại theo hạng trung bình trên các khối đã chạy chung
+    n_blocks = min(len(costs[i]) for i in alive)
+    mat = np.array([costs[i][:n_blocks] for i in alive]).T
+    mean_rank = np.vstack([rankdata(row) for row in mat]).mean(axis=0)
+    order = [alive[j] for j in np.argsort(mean_rank, kind="stable")]
+    return [{
+        "config": configs[i],
+        "mean_rank": float(mean_rank[alive.index(i)]),
+        "blocks": len(costs[i]),
+        "success": float(np.mean([r["reached"] is not None for r in runs[i]])),
+        "mean_cost": float(np.mean(costs[i])),
+    } for i in order]
+
+
+def tune(solver, instance_list, seeds, time_limit=5.0, gap=5.0, n_configs=16, iterations=2, base=None,
+         space=None, alpha=0.05, first_test=5, n_elites=3, workers=1, seed=0, log=None):
+    rng = np.random.default_rng(seed)
+    base = dict(base or {})
+    space = {k: v for k, v in (space or SPACES[solver]).items() if k not in base}
+    targets = {inst: reference_length(inst) * (1 + gap / 100.0) for inst in instance_list}
+    blocks = [(inst, s) for s in seeds for inst in instance_list]
+
+    elites = []
+    results = []
+    with ProcessPoolExecutor(max_workers=max(1, workers)) as pool:
+        for it in range(iterations):
+            configs = [e["config"] for e in elites]
+            configs += sample_configs(space, n_configs - len(configs), rng,
+                                      [e["config"] for e in elites], scale=0.5 ** (it + 1))
+            order = rng.permutation(len(blocks))
+            if log:
+                log(f"iteration {it + 1}: racing {len(configs)} configurations on {len(blocks)} blocks")
+            results = race(solver, configs, [blocks[j] for j in order], targets, base, time_limit, pool,
+                           alpha, first_test, log)
+            elites = results[:n_elites]
+    best = results[0]
+    return {"solver": solver, "best": dict(base, **best["config"]), "survivors": results,
+            "targets": targets, "gap": gap, "time_limit": time_limit}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="F-race style parameter tuner for GA / ACO")
+    parser.add_argument("--solver", choices=sorted(SPACES), default="aco")
+    parser.add_argument("--instances", nargs="+", default=["100", "200"],
+                        help="generated sizes, TSPLIB names from benchmarks/data or instance files")
+    parser.add_argument("--seeds", nargs="+", type=int, default=[0, 1, 2])
+    parser.add_argument("--time-limit", type=float, default=5.0, help="seconds per run")
+    parser.add_argument("--gap", type=float, default=5.0, help="target: %% above the greedy + 2-opt reference")
+    parser.add_argument("--configs", type=int, default=16, help="configurations raced per iteration")
+    parser.add_argument("--iterations", type=int, default=2)
+    parser.add_argument("--first-test", type=int, default=5, help="blocks before the first Friedman test")
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--fix", nargs="*", metavar="KEY=VALUE", help="fixed solver parameters (not tuned)")
+    parser.add_argument("--workers", type=int, default=1, help="process pool size")
+    parser.add_argument("--seed", type=int, default=0, help="seed for sampling configurations")
+    parser.add_argument("--json", help="write the result to this file")
+    args = parser.parse_args(argv)
+
+    def log(msg):
+        print(msg, file=sys.stderr)
+
+    res = tune(args.solver, args.instances, args.seeds, args.time_limit, args.gap, args.configs,
+               args.iterations, parse_params(args.fix), alpha=args.alpha, first_test=args.first_test,
+               workers=args.workers, seed=args.seed, log=log)
+
+    print(f"{'rank':>6}{'success':>9}{'cost':>9}  config")
+    for s in res["survivors"]:
+        print(f"{s['mean_rank']:>6.2f}{100 * s['success']:>8.0f}%{s['mean_cost']:>9.3f}  {json.dumps(s['config'])}")
+    print("best:", json.dumps(res["best"]))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(res, f, indent=2)
+    return res
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import math
+import numpy as np
+
+# Kiểm định Friedman + so sánh sau kiểm định theo F-race (Birattari và cộng sự, 2002).
+# Không dùng scipy: phân phối chi bình phương / Student-t tính qua hàm gamma / beta không đầy đủ
+
+
+def rankdata(x):
+    # Hạng từ 1, giá trị bằng nhau nhận hạng trung bình
+    x = np.asarray(x, dtype=np.float64)
+    order = np.argsort(x, kind="stable")
+    ranks = np.empty(len(x))
+    sx = x[order]
+    i = 0
+    while i < len(x):
+        j = i
+        while j + 1 < len(x) and sx[j + 1] == sx[i]:
+            j += 1
+        ranks[order[i:j + 1]] = (i + j) / 2.0 + 1
+        i = j + 1
+    return ranks
+
+
+def _gammaincc(a, x):
+    # Hàm gamma không đầy đủ chuẩn hoá phần trên Q(a, x)
+    if x <= 0:
+        return 1.0
+    gln = math.lgamma(a)
+    if x < a + 1:
+        term = total = 1.0 / a
+        ap = a
+        for _ in range(500):
+            ap += 1
+            term *= x / ap
+            total += term
+            if abs(term) < abs(total) * 1e-15:
+                break
+        return 1.0 - total * math.exp(-x + a * math.log(x) - gln)
+    # Phân số liên tục (Lentz)
+    b = x + 1 - a
+    c = 1.0 / 1e-300
+    d = 1.0 / b
+    h = d
+    for i in range(1, 500):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = 1e-300 if abs(d) < 1e-300 else d
+        c = b + an / c
+        c = 1e-300 if abs(c) < 1e-300 else c
+        d = 1.0 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return math.exp(-x + a * math.log(x) - gln) * h
+
+
+def chi2_sf(x, df):
+    return _gammaincc(df / 2.0, x / 2.0)
+
+
+def _betacf(a, b, x):
+    qab, qap, qam = a + b, a + 1, a - 1
+    c = 1.0
+    d = 1 - qab * x / qap
+    d = 1.0 / (1e-300 if abs(d) < 1e-300 else d)
+    h = d
+    for m in range(1, 500):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1 + aa * d
+        d = 1.0 / (1e-300 if abs(d) < 1e-300 else d)
+        c = 1 + aa / c
+        c = 1e-300 if abs(c) < 1e-300 else c
+        h *= d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1 + aa * d
+        d = 1.0 / (1e-300 if abs(d) < 1e-300 else d)
+        c = 1 + aa / c
+        c = 1e-300 if abs(c) < 1e-300 else c
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return h
+
+
+def _betainc(a, b, x):
+    # Hàm beta không đầy đủ chuẩn hoá I_x(a, b)
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log(1 - x))
+    if x < (a + 1) / (a + b + 2):
+        return front * _betacf(a, b, x) / a
+    return 1.0 - front * _betacf(b, a, 1 - x) / b
+
+
+def t_cdf(t, df):
+    p = 0.5 * _betainc(df / 2.0, 0.5, df / (df + t * t))
+    return 1.0 - p if t >= 0 else p
+
+
+def t_ppf(q, df):
+    # Phân vị của Student-t bằng chia đôi (chỉ cần cho q > 0.5)
+    lo, hi = 0.0, 1.0
+    while t_cdf(hi, df) < q:
+        hi *= 2
+    for _ in range(100):
+        mid = (lo + hi) / 2
+        if t_cdf(mid, df) < q:
+            lo = mid
+        else:
+            hi = mid
+    return (lo + hi) / 2
+
+
+def friedman(costs):
+    # costs: mảng b khối x k cấu hình (nhỏ hơn = tốt hơn) -> (thống kê T, p-value, ma trận hạng)
+    costs = np.asarray(costs, dtype=np.float64)
+    b, k = costs.shape
+    ranks = np.vstack([rankdata(row) for row in costs])
+    r = ranks.sum(axis=0)
+    denom = (ranks ** 2).sum() - b * k * (k + 1) ** 2 / 4.0
+    if k < 2 or denom <= 1e-12:
+        return 0.0, 1.0, ranks
+    t = (k - 1) * ((r - b * (k + 1) / 2.0) ** 2).sum() / denom
+    return t, chi2_sf(t, k - 1), ranks
+
+
+def race_survivors(costs, alpha=0.05):
+    # Một bước F-race: nếu Friedman bác bỏ "mọi cấu hình như nhau" thì loại các cấu hình có tổng hạng
+    # kém hơn cấu hình tốt nhất một khoảng có ý nghĩa; trả về chỉ số các cấu hình còn lại
+    costs = np.asarray(costs, dtype=np.float64)
+    b, k = costs.shape
+    t, p, ranks = friedman(costs)
+    if p >= alpha or b < 2:
+        return list(range(k))
+    r = ranks.sum(axis=0)
+    denom = (ranks ** 2).sum() - b * k * (k + 1) ** 2 / 4.0
+    dof = (b - 1) * (k - 1)
+    crit = t_ppf(1 - alpha / 2, dof) * math.sqrt(2 * b * (1 - t / (b * (k - 1))) * denom / dof)
+    best = r.min()
+    return [j for j in range(k) if r[j] - best <= crit]
@@ -0,0 +1,122 @@
+import math
+import numpy as np
+
+
+class GridIndex:
+    # Lưới đều phủ các thành phố, mỗi ô chứa trung bình ~per_cell điểm
+    def __init__(self, points, per_cell=2.0):
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        n = len(self.points)
+        lo = self.points.min(axis=0)
+        hi = self.points.max(axis=0)
+        span = np.maximum(hi - lo, 1e-9)
+        self.cell = max(math.sqrt(span[0] * span[1] * per_cell / max(n, 1)), 1e-9)
+        self.lo = lo
+        self.nx = int(span[0] // self.cell) + 1
+        self.ny = int(span[1] // self.cell) + 1
+
+        ix, iy = self.cell_of(self.points)
+        ids = iy * self.nx + ix
+        self.order = np.argsort(ids, kind="stable")
+        self.starts = np.searchsorted(ids[self.order], np.arange(self.nx * self.ny + 1))
+        self.ix = ix
+        self.iy = iy
+
+    def cell_of(self, pts):
+        c = ((pts - self.lo) // self.cell).astype(np.int64)
+        return np.clip(c[:, 0], 0, self.nx - 1), np.clip(c[:, 1], 0, self.ny - 1)
+
+    def cells(self):
+        for cid in range(self.nx * self.ny):
+            a, b = self.starts[cid], self.starts[cid + 1]
+            if a < b:
+                yield cid % self.nx, cid // self.nx, self.order[a:b]
+
+    def block(self, cx, cy, r):
+        # Các điểm nằm trong khối (2r+1) x (2r+1) ô quanh ô (cx, cy); mỗi hàng ô là một đoạn liên tục
+        x0, x1 = max(cx - r, 0), min(cx + r, self.nx - 1)
+        parts = []
+        for y in range(max(cy - r, 0), min(cy + r, self.ny - 1) + 1):
+            a = self.starts[y * self.nx + x0]
+            b = self.starts[y * self.nx + x1 + 1]
+            if a < b:
+                parts.append(self.order[a:b])
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    def covers_all(self, cx, cy, r):
+        return cx - r <= 0 and cy - r <= 0 and cx + r >= self.nx - 1 and cy + r >= self.ny - 1
+
+    def knn(self, k):
+        n = len(self.points)
+        k = min(k, n - 1)
+        out = np.empty((n, k), dtype=np.int32)
+        if k <= 0:
+            return out
+        for cx, cy, members in self.cells():
+            r = 1
+            while True:
+                cand = self.block(cx, cy, r)
+                if len(cand) > k:
+                    pm = self.points[members]
+                    pc = self.points[cand]
+                    d = np.hypot(pm[:, None, 0] - pc[None, :, 0], pm[:, None, 1] - pc[None, :, 1])
+                    d[members[:, None] == cand[None, :]] = np.inf
+                    part = np.argpartition(d, k - 1, axis=1)[:, :k]
+                    kth = np.take_along_axis(d, part, axis=1).max(axis=1)
+                    # Điểm ngoài khối cách ít nhất r ô -> kết quả chắc chắn đúng khi kth <= r * cell
+                    if self.covers_all(cx, cy, r) or np.all(kth <= r * self.cell):
+                        pd = np.take_along_axis(d, part, axis=1)
+                        srt = np.argsort(pd, axis=1, kind="stable")
+                        out[members] = cand[np.take_along_axis(part, srt, axis=1)]
+                        break
+                r += 1
+        return out
+
+
+def candidate_lists(cities, k=10):
+    # Danh sách k láng giềng gần nhất của mỗi thành phố, sắp theo khoảng cách tăng dần
+    return GridIndex(cities).knn(k)
+
+
+def _nearest(points, i, k):
+    d = np.hypot(points[:, 0] - points[i, 0], points[:, 1] - points[i, 1])
+    d[i] = np.inf
+    part = np.argpartition(d, k - 1)[:k] if k < len(d) else np.arange(len(d))
+    return part[np.argsort(d[part], kind="stable")][:k]
+
+
+def insert_candidates(cand, points):
+    # points đã có thành phố mới ở cuối: thêm hàng cho nó và chèn nó vào danh sách của các thành phố
+    # nhận nó làm láng giềng gần hơn láng giềng thứ k hiện tại (chỉ các hàng này thay đổi)
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    new = len(points) - 1
+    k = cand.shape[1]
+    if k >= new - 1:
+        # Danh sách đang bị giới hạn bởi số thành phố quá ít (đã chứa mọi thành phố) -> dựng lại
+        return candidate_lists(points, max(k, min(10, new)))
+    d_new = np.hypot(points[:new, 0] - points[new, 0], points[:new, 1] - points[new, 1])
+    rows = np.arange(new)
+    kth = np.hypot(points[cand[:, -1], 0] - points[rows, 0], points[cand[:, -1], 1] - points[rows, 1])
+    out = np.vstack([cand, _nearest(points, new, k)[None]]).astype(np.int32)
+    for r in np.nonzero(d_new < kth)[0]:
+        d_row = np.hypot(points[cand[r], 0] - points[r, 0], points[cand[r], 1] - points[r, 1])
+        s = int(np.searchsorted(d_row, d_new[r], side="right"))
+        out[r, s + 1:] = cand[r, s:-1]
+        out[r, s] = new
+    return out
+
+
+def delete_candidates(cand, points, i):
+    # points đã bỏ thành phố i (các chỉ số sau i lùi 1): bỏ hàng i, đánh lại chỉ số,
+    # chỉ tìm lại láng giềng cho các hàng từng chứa i
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    n = len(points)
+    k = min(cand.shape[1], n - 1)
+    if k < cand.shape[1]:
+        return candidate_lists(points, k)
+    out = np.delete(cand, i, axis=0)
+    hit = np.nonzero((out == i).any(axis=1))[0]
+    out = out - (out > i)
+    for r in hit:
+        out[r] = _nearest(points, r, k)
+    return out.astype(np.int32)
@@ -0,0 +1,34 @@
+import os
+import json
+import numpy as np
+
+# Checkpoint dạng .npz: các mảng trạng thái + một chuỗi JSON "meta" cho bộ đếm, trạng thái RNG...
+
+
+def rng_state(rng, py_random):
+    # Cả hai nguồn ngẫu nhiên riêng của solver: numpy Generator và random.Random (engine list của GA, ACO cũ)
+    return {"numpy": rng.bit_generator.state, "random": py_random.getstate()}
+
+
+def restore_rng(rng, state, py_random):
+    rng.bit_generator.state = state["numpy"]
+    version, internal, gauss = state["random"]
+    py_random.setstate((version, tuple(internal), gauss))
+
+
+def save(path, meta, **arrays):
+    # Ghi ra file tạm rồi đổi tên: bị ngắt giữa chừng thì checkpoint cũ vẫn còn nguyên
+    folder = os.path.dirname(os.path.abspath(path))
+    os.makedirs(folder, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        np.savez_compressed(f, meta=np.array(json.dumps(meta)), **arrays)
+    os.replace(tmp, path)
+
+
+def load(path):
+    with np.load(path) as z:
+        arrays = {key: z[key] for key in z.files}
+    meta = json.loads(str(arrays.pop("meta")))
+    return meta, arrays
+
@@ -0,0 +1,155 @@
+import os
+import hashlib
+from collections import OrderedDict
+import numpy as np
+
+
+def instance_hash(cities, dtype=np.float64):
+    # Khóa cache: tọa độ + kiểu dữ liệu lưu trữ
+    pts = np.ascontiguousarray(cities, dtype=np.float64)
+    h = hashlib.sha1(pts.tobytes())
+    h.update(np.dtype(dtype).str.encode())
+    return h.hexdigest()[:16]
+
+
+class DistanceMatrix:
+    def __init__(self, cities, dtype=np.float64, cache_dir=None, lazy=False,
+                 row_cache=1024, block=1024):
+        self.cities = cities
+        self.points = np.asarray(cities, dtype=np.float64).reshape(-1, 2)
+        self.n = len(self.points)
+        self.dtype = np.dtype(dtype)
+        self.lazy = lazy
+        self.row_cache = row_cache
+        self.block = block  # Số hàng tính mỗi lần, giới hạn bộ nhớ tạm khi broadcast
+        self.cache_dir = cache_dir
+        self._rows = OrderedDict()
+
+        self.matrix = None
+        if not lazy:
+            self.matrix = self._load_or_build()
+
+    @classmethod
+    def from_array(cls, cities, matrix):
+        # Bọc một ma trận đã có sẵn (vd. shared memory) mà không tính lại
+        dm = cls(cities, dtype=matrix.dtype, lazy=True)
+        dm.lazy = False
+        dm.matrix = matrix
+        return dm
+
+    @property
+    def shape(self):
+        return (self.n, self.n)
+
+    def __len__(self):
+        return self.n
+
+    def _compute_rows(self, rows, out=None):
+        p = self.points[rows]
+        d = np.hypot(p[:, None, 0] - self.points[None, :, 0],
+                     p[:, None, 1] - self.points[None, :, 1])
+        if out is None:
+            return d.astype(self.dtype, copy=False)
+        out[...] = d
+        return out
+
+    def _build(self, out):
+        for start in range(0, self.n, self.block):
+            stop = min(start + self.block, self.n)
+            self._compute_rows(np.arange(start, stop), out[start:stop])
+        return out
+
+    def _load_or_build(self):
+        if self.cache_dir is None:
+            return self._build(np.empty((self.n, self.n), dtype=self.dtype))
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = os.path.join(self.cache_dir, f"dist_{self.n}_{instance_hash(self.points, self.dtype)}.npy")
+        if os.path.exists(path):
+            m = np.load(path, mmap_mode="r")
+            if m.shape == (self.n, self.n) and m.dtype == self.dtype:
+                return m
+
+        # Ghi vào file tạm rồi đổi tên để không để lại cache hỏng nếu bị ngắt giữa chừng
+        tmp = f"{path}.{os.getpid()}.tmp"
+        out = np.lib.format.open_memmap(tmp, mode="w+", dtype=self.dtype, shape=(self.n, self.n))
+        self._build(out)
+        out.flush()
+        del out
+        os.replace(tmp, path)
+        return np.load(path, mmap_mode="r")
+
+    def row(self, i):
+        if self.matrix is not None:
+            return self.matrix[i]
+        i = int(i)
+        r = self._rows.get(i)
+        if r is not None:
+            self._rows.move_to_end(i)
+            return r
+        r = self._compute_rows(np.array([i]))[0]
+        self._rows[i] = r
+        if len(self._rows) > self.row_cache:
+            self._rows.popitem(last=False)
+        return r
+
+    def rows(self, idx):
+        if self.matrix is not None:
+            return self.matrix[idx]
+        return self._compute_rows(np.asarray(idx))
+
+    def between(self, a, b):
+        # Khoảng cách từng cặp (a[k], b[k])
+        if self.matrix is not None:
+            return self.matrix[a, b]
+        pa = self.points[a]
+        pb = self.points[b]
+        return np.hypot(pa[..., 0] - pb[..., 0], pa[..., 1] - pb[..., 1]).astype(self.dtype, copy=False)
+
+    def __getitem__(self, key):
+        if self.matrix is not None:
+            return self.matrix[key]
+        if isinstance(key, tuple) and len(key) == 2:
+            return self.between(*key)
+        return self.rows(key) if np.ndim(key) else self.row(key)
+
+    def dense(self):
+        # Chế độ lazy: dựng toàn bộ ma trận khi thuật toán thật sự cần n x n
+        if self.matrix is None:
+            self.matrix = self._load_or_build()
+            self.lazy = False
+            self._rows.clear()
+        return self.matrix
+
+    def add_point(self, p):
+        # Thêm một thành phố ở cuối: chỉ tính hàng / cột mới, phần đã có giữ nguyên
+        self.points = np.vstack([self.points, np.asarray(p, dtype=np.float64).reshape(1, 2)])
+        self.cities = self.points
+        self.n += 1
+        self._rows.clear()
+        if self.matrix is not None:
+            m = np.empty((self.n, self.n), dtype=self.dtype)
+            m[:-1, :-1] = self.matrix
+            last = self._compute_rows(np.array([self.n - 1]))[0]
+            m[-1] = last
+            m[:, -1] = last
+            self.matrix = m
+        return self.n - 1
+
+    def remove_point(self, i):
+        # Bỏ thành phố i; các chỉ số sau i lùi 1
+        self.points = np.delete(self.points, i, axis=0)
+        self.cities = self.points
+        self.n -= 1
+        self._rows.clear()
+        if self.matrix is not None:
+            self.matrix = np.delete(np.delete(self.matrix, i, axis=0), i, axis=1)
+
+    def tour_lengths(self, tours):
+        # Độ dài của nhiều tour cùng lúc: tours là mảng 2 chiều (số tour x n)
+        t = np.asarray(tours)
+        return self.between(t, np.roll(t, -1, axis=1)).sum(axis=1, dtype=np.float64)
+
+    def tour_length(self, tour):
+        t = np.asarray(tour)
+        return float(self.between(t, np.roll(t, -1)).sum(dtype=np.float64))
@@ -0,0 +1,36 @@
+import numpy as np
+
+# Chỉ số hội tụ: càng nhỏ -> quần thể / pheromone càng dồn về một lời giải
+
+
+def edge_diversity(pop):
+    # Tỉ lệ cạnh (vô hướng) khác nhau trong quần thể: 0 = mọi cá thể cùng một tập cạnh,
+    # 1 = không có cạnh nào dùng chung
+    pop = np.asarray(pop, dtype=np.int64)
+    m, n = pop.shape
+    if m < 2 or n < 3:
+        return 0.0
+    nxt = np.roll(pop, -1, axis=1)
+    keys = np.minimum(pop, nxt) * n + np.maximum(pop, nxt)
+    return (np.unique(keys).size - n) / (n * (m - 1))
+
+
+def branching_factor(tau, lam=0.05):
+    # lambda-branching factor: số cạnh trung bình mỗi đỉnh có tau >= tau_min + lam * (tau_max - tau_min);
+    # pheromone đối xứng đã hội tụ -> ~2
+    tau = np.asarray(tau)
+    lo = tau.min(axis=1, keepdims=True)
+    hi = tau.max(axis=1, keepdims=True)
+    return float((tau >= lo + lam * (hi - lo)).sum(axis=1).mean())
+
+
+def pheromone_entropy(tau):
+    # Entropy chuẩn hoá của phân bố pheromone trên từng hàng, trung bình: 1 = đều, 0 = dồn vào một cạnh
+    tau = np.asarray(tau, dtype=np.float64)
+    width = tau.shape[1]
+    if width < 2:
+        return 0.0
+    p = tau / tau.sum(axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        h = -np.where(p > 0, p * np.log(p), 0.0).sum(axis=1)
+    return float(h.mean() / np.log(width))
@@ -0,0 +1,38 @@
+from collections import OrderedDict
+import numpy as np
+
+
+class FitnessCache:
+    # Đánh giá cả quần thể một lần; cá thể đã gặp (vd. cá thể ưu tú) lấy lại từ cache
+    def __init__(self, dist_matrix, maxsize=1024):
+        self.dm = dist_matrix
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        self._cache.clear()
+
+    def evaluate(self, pop):
+        pop = np.asarray(pop, dtype=np.int32)
+        out = np.empty(len(pop))
+        keys = [row.tobytes() for row in pop]
+        miss = []
+        for i, key in enumerate(keys):
+            val = self._cache.get(key)
+            if val is None:
+                miss.append(i)
+            else:
+                self._cache.move_to_end(key)
+                out[i] = val
+        self.hits += len(pop) - len(miss)
+        self.misses += len(miss)
+
+        if miss:
+            out[miss] = self.dm.tour_lengths(pop[miss])
+            for i in miss:
+                self._cache[keys[i]] = out[i]
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return out
@@ -0,0 +1,217 @@
+import os
+import numpy as np
+
+# Lịch sử hội tụ (vòng, best) lưu trong mảng gọn thay cho list tuple:
+#   "all"          mọi vòng
+#   "improvements" chỉ các vòng best giảm
+#   "log"          giãn dần theo cấp số nhân: vòng 0, 1, 2, ... rồi thưa dần (~factor lần mỗi điểm)
+#   "ring"         chỉ giữ capacity điểm gần nhất
+# path: ghi dần từng điểm được giữ ra file (.csv hoặc nhị phân) trong lúc chạy -> bị ngắt vẫn còn dữ liệu.
+# File nhị phân dạng cột theo khối: mỗi lần flush ghi [số điểm k (<i8)][k iteration (<i8)][k best (<f8)]
+POLICIES = ("all", "improvements", "log", "ring")
+RECORD = np.dtype([("iteration", "<i8"), ("best", "<f8")])
+
+
+def _write_block(f, iterations, best):
+    np.array([len(iterations)], dtype="<i8").tofile(f)
+    np.asarray(iterations, dtype="<i8").tofile(f)
+    np.asarray(best, dtype="<f8").tofile(f)
+
+
+class History:
+    def __init__(self, policy="all", capacity=1024, factor=1.05, path=None, flush_every=256):
+        if policy not in POLICIES:
+            raise ValueError(f"policy phải là một trong {POLICIES}, không phải {policy!r}")
+        if policy == "ring" and capacity < 1:
+            raise ValueError("capacity phải >= 1")
+        self.policy = policy
+        self.capacity = capacity
+        self.factor = factor
+        self.path = path
+        self.flush_every = flush_every
+        self._data = np.empty(capacity if policy == "ring" else 64, dtype=RECORD)
+        self._len = 0
+        self._head = 0  # ring: vị trí điểm cũ nhất
+        self._last = float("inf")  # best của điểm gần nhất đã giữ
+        self._next = 0  # log: vòng kế tiếp cần giữ
+        self._tail = None  # điểm cuối cùng được đưa vào (kể cả điểm bị bỏ)
+        self._tail_kept = True
+        self._pending = []
+        self._file = None
+        self._streamed = False  # file đã được tạo -> các lần mở sau ghi nối
+        self.recorded = 0  # tổng số điểm đã giữ (ring: kể cả điểm đã bị đẩy ra)
+
+    @classmethod
+    def make(cls, spec):
+        # None -> mặc định; chuỗi -> tên policy; History -> dùng luôn
+        if spec is None:
+            return cls()
+        if isinstance(spec, str):
+            return cls(spec)
+        return spec
+
+    def _keep(self, it, value):
+        if self.policy == "improvements":
+            return value < self._last
+        if self.policy == "log":
+            if it < self._next:
+                return False
+            self._next = max(it + 1, int(np.ceil(it * self.factor)))
+            return True
+        return True
+
+    def record(self, it, value):
+        self._tail = (it, value)
+        self._tail_kept = self._keep(it, value)
+        if self._tail_kept:
+            self._store(it, value)
+
+    def _store(self, it, value):
+        if self.policy == "ring":
+            if self._len < self.capacity:
+                self._data[self._len] = (it, value)
+                self._len += 1
+            else:
+                self._data[self._head] = (it, value)
+                self._head = (self._head + 1) % self.capacity
+        else:
+            if self._len == len(self._data):
+                self._data = np.resize(self._data, 2 * len(self._data))
+            self._data[self._len] = (it, value)
+            self._len += 1
+        self._last = value
+        self.recorded += 1
+        if self.path is not None:
+            self._pending.append((it, value))
+            if len(self._pending) >= self.flush_every:
+                self.flush()
+
+    def to_array(self):
+        # Mảng bản ghi (iteration, best) theo thứ tự thời gian
+        if self.policy == "ring" and self._len == self.capacity:
+            return np.concatenate([self._data[self._head:], self._data[:self._head]])
+        return self._data[:self._len].copy()
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        arr = self.to_array()
+        return zip(arr["iteration"].tolist(), arr["best"].tolist())
+
+    def __getitem__(self, k):
+        arr = self.to_array()
+        return int(arr["iteration"][k]), float(arr["best"][k])
+
+    def _open(self, mode):
+        if self.path.lower().endswith(".csv"):
+            f = open(self.path, mode, newline="")
+            if mode == "w":
+                f.write("iteration,best_length\n")
+        else:
+            f = open(self.path, mode + "b")
+        return f
+
+    def flush(self):
+        if self.path is None:
+            return
+        if self._file is None:
+            self._file = self._open("a" if self._streamed else "w")
+            self._streamed = True
+        if self._pending:
+            if self.path.lower().endswith(".csv"):
+                self._file.write("".join(f"{it},{value!r}\n" for it, value in self._pending))
+            else:
+                arr = np.array(self._pending, dtype=RECORD)
+                _write_block(self._file, arr["iteration"], arr["best"])
+            self._pending = []
+        self._file.flush()
+
+    def close(self):
+        # Luôn giữ điểm cuối (best khi dừng) rồi đóng file
+        if self._tail is not None and not self._tail_kept:
+            self._store(*self._tail)
+            self._tail_kept = True
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def state(self):
+        return {"recorded": self.recorded, "last": self._last, "next": self._next}
+
+    def restore(self, arr, state=None):
+        # Nạp lại từ checkpoint; file đang ghi dần được cắt về đúng số điểm tại checkpoint rồi ghi tiếp
+        arr = np.asarray(arr, dtype=RECORD)
+        self._head = 0
+        if self.policy == "ring":
+            arr = arr[-self.capacity:]
+            self._data = np.empty(self.capacity, dtype=RECORD)
+            self._data[:len(arr)] = arr
+        else:
+            self._data = np.resize(arr, max(64, len(arr)))
+        self._len = len(arr)
+        state = state or {}
+        self.recorded = state.get("recorded", len(arr))
+        self._last = state.get("last", float(arr["best"][-1]) if len(arr) else float("inf"))
+        self._next = state.get("next", 0)
+        self._tail = None
+        self._tail_kept = True
+        self._pending = []
+        if self.path is not None and os.path.exists(self.path):
+            self._truncate_stream(self.recorded)
+
+    def _truncate_stream(self, count):
+        if self._file is not None:
+            self._file.close()
+        if self.path.lower().endswith(".csv"):
+            with open(self.path, newline="") as f:
+                lines = f.readlines()[:count + 1]
+            with open(self.path, "w", newline="") as f:
+                f.writelines(lines)
+        else:
+            # Các khối có kích thước tuỳ lần flush -> đọc lại rồi ghi count điểm đầu thành một khối
+            iterations, best = read_history(self.path)
+            with open(self.path, "wb") as f:
+                _write_block(f, iterations[:count], best[:count])
+        self._file = self._open("a")
+        self._streamed = True
+
+    def __getstate__(self):
+        # Gửi qua process khác (snapshot GUI): chỉ mang dữ liệu, không mang file đang mở
+        state = self.__dict__.copy()
+        state["_data"] = self.to_array()
+        state["_head"] = 0
+        state["_file"] = None
+        state["_pending"] = []
+        state["path"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.policy == "ring":
+            data = np.empty(self.capacity, dtype=RECORD)
+            data[:self._len] = self._data
+            self._data = data
+
+
+def read_history(path):
+    # Đọc file do History ghi ra -> (iterations, best)
+    if path.lower().endswith(".csv"):
+        arr = np.loadtxt(path, delimiter=",", skiprows=1, ndmin=2)
+        return arr[:, 0].astype(np.int64), arr[:, 1]
+    with open(path, "rb") as f:
+        data = f.read()
+    words = np.frombuffer(data[:len(data) // 8 * 8], dtype="<i8")
+    iterations, best = [], []
+    pos = 0
+    while pos < len(words):
+        k = int(words[pos])
+        if pos + 1 + 2 * k > len(words):
+            break  # khối cuối ghi dở (bị ngắt giữa chừng)
+        iterations.append(words[pos + 1:pos + 1 + k])
+        best.append(words[pos + 1 + k:pos + 1 + 2 * k].view("<f8"))
+        pos += 1 + 2 * k
+    if not iterations:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+    return np.concatenate(iterations).astype(np.int64), np.concatenate(best).astype(np.float64)
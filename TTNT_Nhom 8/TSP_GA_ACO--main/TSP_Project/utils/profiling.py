@@ -0,0 +1,60 @@
+import time
+
+# Bấm giờ theo pha + bộ đếm cho vòng lặp nóng của GA / ACO.
+# Tắt (mặc định): tic() trả 0, toc() / count() return ngay -> chi phí chỉ là một lời gọi hàm.
+#   t = prof.tic(); ...; prof.toc("construct", t); prof.count("tours_built", n_ants)
+
+
+class Profiler:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.reset()
+
+    @classmethod
+    def make(cls, spec):
+        # True / False -> Profiler mới; Profiler -> dùng luôn (vd. dùng chung cho nhiều solver)
+        if isinstance(spec, Profiler):
+            return spec
+        return cls(bool(spec))
+
+    def reset(self):
+        self.times = {}
+        self.calls = {}
+        self.counters = {}
+        self.started = time.perf_counter()
+
+    def tic(self):
+        return time.perf_counter() if self.enabled else 0.0
+
+    def toc(self, phase, t0):
+        if self.enabled:
+            self.times[phase] = self.times.get(phase, 0.0) + time.perf_counter() - t0
+            self.calls[phase] = self.calls.get(phase, 0) + 1
+
+    def count(self, name, k=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + k
+
+    def snapshot(self):
+        # Dict thuần (ghi thẳng ra JSON được): thời gian từng pha, tỉ lệ trên tổng thời gian đo, bộ đếm
+        total = sum(self.times.values())
+        phases = {
+            name: {"time": t, "calls": self.calls[name], "share": t / total if total else 0.0}
+            for name, t in sorted(self.times.items(), key=lambda kv: -kv[1])
+        }
+        return {
+            "enabled": self.enabled,
+            "elapsed": time.perf_counter() - self.started,
+            "phases": phases,
+            "counters": dict(self.counters),
+        }
+
+
+def format_stats(stats):
+    # Bảng chữ gọn để in ra terminal
+    lines = [f"{'phase':<16}{'time (s)':>10}{'calls':>9}{'share':>8}"]
+    for name, p in stats["phases"].items():
+        lines.append(f"{name:<16}{p['time']:>10.4f}{p['calls']:>9}{100 * p['share']:>7.1f}%")
+    for name, value in stats["counters"].items():
+        lines.append(f"{name:<16}{value:>10}")
+    return "\n".join(lines)
@@ -0,0 +1,93 @@
+import os
+import time
+from algorithms.ga import GA
+from algorithms.aco import ACO
+from algorithms.island import IslandGA
+from algorithms.parallel_aco import ParallelACO
+from algorithms.decompose import Decomposition
+from utils.tsp_utils import generate_cities, load_cities
+from utils.distance import DistanceMatrix
+
+SOLVERS = {"ga": GA, "aco": ACO, "island": IslandGA, "paco": ParallelACO, "decomp": Decomposition}
+
+# Các solver có save_checkpoint / load_checkpoint
+CHECKPOINTABLE = ("ga", "aco", "paco")
+
+# Các solver có profile=True / stats()
+PROFILABLE = ("ga", "aco", "paco")
+
+# Tên tham số "số vòng lặp" của từng thuật toán (decomp: số vòng của solver trên mỗi cụm)
+ITER_PARAM = {"ga": "generations", "aco": "n_iter", "island": "generations", "paco": "n_iter", "decomp": "iterations"}
+
+
+def make_cities(instance, instance_seed=0):
+    # instance: số thành phố (sinh ngẫu nhiên) hoặc đường dẫn file
+    if isinstance(instance, int) or str(instance).isdigit():
+        return generate_cities(int(instance), width=1000, height=1000, seed=instance_seed)
+    return load_cities(instance)
+
+
+def make_solver(name, cities, params=None, seed=None, iterations=None):
+    params = dict(params or {})
+    if iterations is not None:
+        params[ITER_PARAM[name]] = iterations
+    return SOLVERS[name](cities, seed=seed, **params)
+
+
+def run_solver(solver, time_limit=None, target=None):
+    # Chạy generator hết tốc độ (không có timer GUI), dừng khi hết vòng, hết giờ hoặc đạt target
+    start = time.perf_counter()
+    best_tour, best_len, steps, time_best = None, float("inf"), 0, 0.0
+    trace = []
+    for it, tour, length, improved in solver.run_stepwise():
+        steps = it + 1
+        elapsed = time.perf_counter() - start
+        if improved or best_tour is None:
+            best_tour, best_len, time_best = tour, length, elapsed
+            trace.append((it, elapsed, length))
+        if target is not None and best_len <= target:
+            break
+        if time_limit is not None and elapsed >= time_limit:
+            break
+    return {
+        "best_length": float(best_len),
+        "iterations": steps,
+        "wall_time": time.perf_counter() - start,
+        "time_to_best": time_best,
+        "tour": [int(c) for c in best_tour] if best_tour is not None else None,
+        "trace": trace,
+    }
+
+
+def checkpoint_file(job):
+    inst = os.path.splitext(os.path.basename(str(job["instance"])))[0]
+    return os.path.join(job["checkpoint_dir"], f"{job['solver']}_{inst}_seed{job.get('seed')}.npz")
+
+
+def run_job(job):
+    # job là dict thuần (picklable) để chạy trong process pool
+    cities = make_cities(job["instance"], job.get("instance_seed", 0))
+    params = dict(job.get("params") or {})
+    path = None
+    if job.get("checkpoint_dir") and job["solver"] in CHECKPOINTABLE:
+        # Ma trận khoảng cách được cache cạnh checkpoint -> chạy lại không phải dựng lại
+        path = checkpoint_file(job)
+        params.setdefault("dist", DistanceMatrix(cities, cache_dir=job["checkpoint_dir"]))
+        params.update(checkpoint_path=path, checkpoint_every=job.get("checkpoint_every") or 0)
+    profile = job.get("profile") and job["solver"] in PROFILABLE
+    if profile:
+        params["profile"] = True
+    solver = make_solver(job["solver"], cities, params, job.get("seed"), job.get("iterations"))
+    if path and job.get("resume") and os.path.exists(path):
+        solver.load_checkpoint(path)
+    res = run_solver(solver, job.get("time_limit"), job.get("target"))
+    res.update({
+        "solver": job["solver"],
+        "instance": str(job["instance"]),
+        "n": len(cities),
+        "seed": job.get("seed"),
+        "params": job.get("params") or {},
+    })
+    if profile:
+        res["stats"] = solver.stats()
+    return res
@@ -0,0 +1,35 @@
+from multiprocessing import shared_memory
+import numpy as np
+
+
+class SharedArray:
+    # Mảng NumPy nằm trên multiprocessing.shared_memory; process con chỉ cần spec (tên, shape, dtype) để gắn vào
+    def __init__(self, shm, shape, dtype, owner):
+        self.shm = shm
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.owner = owner
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=shm.buf)
+
+    @classmethod
+    def create(cls, data):
+        data = np.asarray(data)
+        shm = shared_memory.SharedMemory(create=True, size=max(data.nbytes, 1))
+        sa = cls(shm, data.shape, data.dtype, owner=True)
+        sa.array[...] = data
+        return sa
+
+    @classmethod
+    def attach(cls, spec):
+        name, shape, dtype = spec
+        return cls(shared_memory.SharedMemory(name=name), shape, dtype, owner=False)
+
+    @property
+    def spec(self):
+        return (self.shm.name, self.shape, self.dtype.str)
+
+    def close(self):
+        self.array = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -1,10 +1,32 @@
 import random
 import math
-def generate_cities(n, width=800, height=600):
+def generate_cities(n, width=800, height=600, seed=None):
     # Tạo thành phố ngẫu nhiên trong khung hình, chừa lề 50px
-    return [(random.randint(50, width - 50), random.randint(50, height - 50)) for _ in range(n)]
+    rng = random if seed is None else random.Random(seed)
+    return [(rng.randint(50, width - 50), rng.randint(50, height - 50)) for _ in range(n)]
 
-def total_distance(path, cities):
+def load_cities(path):
+    if str(path).lower().endswith(".tsp"):
+        from utils.tsplib import read_tsplib
+        return read_tsplib(path).cities
+    # File toạ độ đơn giản: mỗi dòng "x y" hoặc "x,y" (có thể thêm cột id ở đầu); bỏ dòng trống / chú thích #
+    cities = []
+    with open(path) as f:
+        for line in f:
+            parts = line.replace(",", " ").split()
+            if not parts or line.lstrip().startswith("#"):
+                continue
+            try:
+                nums = [float(p) for p in parts]
+            except ValueError:
+                continue  # dòng tiêu đề
+            cities.append((nums[-2], nums[-1]))
+    return cities
+
+def total_distance(path, cities, dist_matrix=None):
+    # Có ma trận khoảng cách (utils.distance.DistanceMatrix) thì tra bảng thay vì tính lại
+    if dist_matrix is not None:
+        return dist_matrix.tour_length(path)
     dist = 0
     for i in range(len(path)):
         x1, y1 = cities[path[i]]
@@ -0,0 +1,97 @@
+import math
+import numpy as np
+
+# Đọc file TSPLIB (.tsp / .tour) với các kiểu khoảng cách EUC_2D, ATT, GEO
+SUPPORTED = ("EUC_2D", "ATT", "GEO")
+EARTH_RADIUS = 6378.388
+
+
+class TSPLIBInstance:
+    def __init__(self, name, coords, edge_weight_type, comment=""):
+        self.name = name
+        self.coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        self.edge_weight_type = edge_weight_type
+        self.comment = comment
+        self.n = len(self.coords)
+
+    @property
+    def cities(self):
+        # Toạ độ phẳng để đưa vào GA / ACO (vốn dùng khoảng cách Euclid)
+        if self.edge_weight_type == "GEO":
+            lat, lon = _geo_radians(self.coords)
+            lat0 = lat.mean()
+            xy = np.column_stack([EARTH_RADIUS * lon * math.cos(lat0), EARTH_RADIUS * lat])
+            return [tuple(p) for p in xy.tolist()]
+        return [tuple(p) for p in self.coords.tolist()]
+
+    def edge_lengths(self, a, b):
+        # Khoảng cách nguyên theo đúng quy ước TSPLIB cho từng cặp (a[k], b[k])
+        pa = self.coords[a]
+        pb = self.coords[b]
+        if self.edge_weight_type == "EUC_2D":
+            d = np.hypot(pa[..., 0] - pb[..., 0], pa[..., 1] - pb[..., 1])
+            return np.floor(d + 0.5)
+        if self.edge_weight_type == "ATT":
+            r = np.sqrt(((pa[..., 0] - pb[..., 0]) ** 2 + (pa[..., 1] - pb[..., 1]) ** 2) / 10.0)
+            t = np.floor(r + 0.5)
+            return np.where(t < r, t + 1, t)
+        lat_a, lon_a = _geo_radians(pa)
+        lat_b, lon_b = _geo_radians(pb)
+        q1 = np.cos(lon_a - lon_b)
+        q2 = np.cos(lat_a - lat_b)
+        q3 = np.cos(lat_a + lat_b)
+        arg = np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0)
+        return np.floor(EARTH_RADIUS * np.arccos(arg) + 1.0)
+
+    def tour_length(self, tour):
+        t = np.asarray(tour)
+        return float(self.edge_lengths(t, np.roll(t, -1)).sum())
+
+
+def _geo_radians(coords):
+    # TSPLIB: phần nguyên là độ, phần lẻ là phút (DDD.MM)
+    pi = 3.141592
+    deg = np.trunc(coords)
+    minutes = coords - deg
+    rad = pi * (deg + 5.0 * minutes / 3.0) / 180.0
+    return rad[..., 0], rad[..., 1]
+
+
+def _read_sections(path):
+    header = {}
+    section = None
+    rows = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line == "EOF":
+                continue
+            if section is None and ":" in line:
+                key, _, value = line.partition(":")
+                header[key.strip().upper()] = value.strip()
+            elif line.endswith("SECTION"):
+                section = line
+            elif section is not None:
+                if line == "-1":
+                    section = "END"
+                elif section != "END":
+                    rows.append(line.split())
+    return header, section, rows
+
+
+def read_tsplib(path):
+    header, section, rows = _read_sections(path)
+    ewt = header.get("EDGE_WEIGHT_TYPE", "")
+    if ewt not in SUPPORTED:
+        raise ValueError(f"{path}: EDGE_WEIGHT_TYPE {ewt!r} chưa được hỗ trợ (chỉ {', '.join(SUPPORTED)})")
+    coords = [(float(r[1]), float(r[2])) for r in rows]
+    dim = int(header.get("DIMENSION", len(coords)))
+    if len(coords) != dim:
+        raise ValueError(f"{path}: DIMENSION = {dim} nhưng đọc được {len(coords)} toạ độ")
+    return TSPLIBInstance(header.get("NAME", ""), coords, ewt, header.get("COMMENT", ""))
+
+
+def read_tour(path):
+    # File .tour đánh số từ 1 -> đổi về chỉ số từ 0
+    _, _, rows = _read_sections(path)
+    return [int(tok) - 1 for r in rows for tok in r if tok != "-1"]